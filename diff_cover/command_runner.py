@@ -1,9 +1,18 @@
+import codecs
+from collections import deque
 import six
 import subprocess
+import tempfile
+import threading
 
 import sys
 
 
+# How much of the end of a spooled command's stderr is kept, for error messages
+STDERR_LIMIT = 64 * 1024
+_STDERR_BLOCK_SIZE = 4096
+
+
 class CommandError(Exception):
     """
     Error raised when a command being executed returns an error
@@ -11,11 +20,12 @@ class CommandError(Exception):
     pass
 
 
-def execute(command, exit_codes=[0]):
+def execute(command, exit_codes=[0], stdin=None):
     """Execute provided command returning the stdout
     Args:
         command (list[str]): list of tokens to execute as your command.
         exit_codes (list[int]): exit codes which do not indicate error.
+        stdin (str): text to write to the command's standard input, if any
         subprocess_mod (module): Defaults to pythons subprocess module but you can optionally pass in
         another. This is mostly for testing purposes
     Returns:
@@ -24,18 +34,22 @@ def execute(command, exit_codes=[0]):
         ValueError if there is a error running the command
     """
     stdout_pipe = subprocess.PIPE
-    process = subprocess.Popen(
-        command, stdout=stdout_pipe,
-        stderr=stdout_pipe
-    )
+    if stdin is None:
+        process = subprocess.Popen(
+            command, stdout=stdout_pipe,
+            stderr=stdout_pipe
+        )
+        stdin_data = None
+    else:
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=stdout_pipe,
+            stderr=stdout_pipe
+        )
+        stdin_data = stdin.encode(sys.getfilesystemencoding())
     try:
-        stdout, stderr = process.communicate()
+        stdout, stderr = process.communicate(stdin_data)
     except OSError:
-        sys.stderr.write(" ".join(
-                [cmd.decode(sys.getfilesystemencoding())
-                 if isinstance(cmd, bytes) else cmd
-                 for cmd in command])
-        )
+        _write_command(command)
         raise
 
     stderr = _ensure_unicode(stderr)
@@ -45,6 +59,79 @@ def execute(command, exit_codes=[0]):
     return _ensure_unicode(stdout), stderr
 
 
+def execute_spooled(command, exit_codes=[0], stdin=None):
+    """Execute provided command, spooling its stdout to a temporary file
+    instead of collecting it in memory
+    Args:
+        command (list[str]): list of tokens to execute as your command.
+        exit_codes (list[int]): exit codes which do not indicate error.
+        stdin (str): text to write to the command's standard input, if any
+    Returns:
+        (file, unicode) - the command's stdout, decoded as it is read, which
+        the caller must close, and the last `STDERR_LIMIT` bytes of its stderr
+    Raises:
+        CommandError if the command returns an exit code not in `exit_codes`
+    """
+    stdout_file = tempfile.TemporaryFile()
+    try:
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE if stdin is not None else None,
+            stdout=stdout_file, stderr=subprocess.PIPE
+        )
+    except OSError:
+        stdout_file.close()
+        _write_command(command)
+        raise
+
+    # Read stderr while writing stdin, so that neither pipe fills
+    # up and leaves the command waiting for us
+    stderr_blocks = deque(maxlen=STDERR_LIMIT // _STDERR_BLOCK_SIZE)
+    reader = threading.Thread(target=_read_blocks, args=(process.stderr, stderr_blocks))
+    reader.daemon = True
+    reader.start()
+    if stdin is not None:
+        try:
+            process.stdin.write(stdin.encode(sys.getfilesystemencoding()))
+        except IOError:
+            # The command exited without reading all of its input
+            pass
+        try:
+            process.stdin.close()
+        except IOError:
+            pass
+    process.wait()
+    reader.join()
+    process.stderr.close()
+
+    stderr = _ensure_unicode(b''.join(stderr_blocks))
+    if process.returncode not in exit_codes:
+        stdout_file.close()
+        raise CommandError(stderr)
+
+    stdout_file.seek(0)
+    return codecs.getreader(sys.getfilesystemencoding())(stdout_file, 'replace'), stderr
+
+
+def _read_blocks(stream, blocks):
+    """
+    Read `stream` to the end, appending it a block at a time to the
+    `blocks` deque, which drops the oldest blocks once it is full.
+    """
+    for block in iter(lambda: stream.read(_STDERR_BLOCK_SIZE), b''):
+        blocks.append(block)
+
+
+def _write_command(command):
+    """
+    Write `command` to stderr, to show which command could not be run.
+    """
+    sys.stderr.write(" ".join(
+            [cmd.decode(sys.getfilesystemencoding())
+             if isinstance(cmd, bytes) else cmd
+             for cmd in command])
+    )
+
+
 def run_command_for_code(command):
     """
     Returns command's exit code.
@@ -0,0 +1,122 @@
+"""
+Open coverage and quality reports that may be compressed.
+"""
+from __future__ import unicode_literals
+
+import bz2
+import gzip
+import io
+import os
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSED_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+
+# What the decompressors raise when a report is corrupt or truncated
+# (or is not compressed the way its extension says)
+DECOMPRESSION_ERRORS = (EnvironmentError, EOFError, zlib.error)
+if lzma is not None:
+    DECOMPRESSION_ERRORS += (lzma.LZMAError,)
+if zstandard is not None:
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+
+class ReportError(Exception):
+    """
+    A compressed report could not be decompressed.  Unlike the errors
+    the decompressors raise, this is not an `EnvironmentError`, so it
+    is not mistaken for a tool that is not installed.
+    """
+    pass
+
+
+class _DecompressingReader(io.RawIOBase):
+    """
+    Read from a decompressing `stream`, raising a `ReportError`
+    if the report at `path` turns out to be unreadable.
+    """
+
+    def __init__(self, path, stream):
+        super(_DecompressingReader, self).__init__()
+        self._path = path
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            data = self._stream.read(len(buffer))
+        except DECOMPRESSION_ERRORS as error:
+            raise ReportError("Could not decompress '{}': {}".format(self._path, error))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+        super(_DecompressingReader, self).close()
+
+
+def uncompressed_name(path):
+    """
+    Return `path` without its compression extension, if it has one.
+
+    `coverage.xml.gz` -> `coverage.xml`
+    """
+    root, extension = os.path.splitext(path)
+    if extension.lower() in COMPRESSED_EXTENSIONS:
+        return root
+    return path
+
+
+def open_report(path):
+    """
+    Open the report at `path` for reading as bytes.
+
+    Reports ending in `.gz`, `.bz2`, `.xz` or `.zst` are decompressed
+    as they are read, so they never need to be written to disk (or held
+    in memory) uncompressed.
+
+    Raises an IOError if the report cannot be opened, including when the
+    module needed to decompress it is not available.  A compressed report
+    that turns out to be corrupt raises a `ReportError` when it is read.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.gz':
+        stream = gzip.open(path, 'rb')
+
+    elif extension == '.bz2':
+        stream = bz2.BZ2File(path, 'rb')
+
+    elif extension == '.xz':
+        if lzma is None:
+            raise IOError("Reading '{}' requires the lzma module".format(path))
+        stream = lzma.open(path, 'rb')
+
+    elif extension == '.zst':
+        if zstandard is None:
+            raise IOError("Reading '{}' requires the zstandard package".format(path))
+        compressed = open(path, 'rb')
+        stream = zstandard.ZstdDecompressor().stream_reader(compressed, closefd=True)
+
+    else:
+        return open(path, 'rb')
+
+    # Buffered, since some decompressors' streams do not support
+    # readline(), which we need to iterate over lines
+    return io.BufferedReader(_DecompressingReader(path, stream))
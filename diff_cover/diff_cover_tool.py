@@ -10,11 +10,12 @@ import six
 from xml.etree import cElementTree
 
 from diff_cover import DESCRIPTION, VERSION
+from diff_cover.compression import ReportError, open_report, uncompressed_name
 from diff_cover.diff_reporter import GitDiffReporter
 from diff_cover.git_diff import GitDiffTool
 from diff_cover.git_path import GitPathTool
 from diff_cover.report_generator import HtmlReportGenerator, StringReportGenerator
-from diff_cover.violationsreporters.violations_reporter import XmlCoverageReporter
+from diff_cover.violationsreporters.violations_reporter import LcovCoverageReporter, XmlCoverageReporter
 
 HTML_REPORT_HELP = "Diff coverage HTML output"
 COMPARE_BRANCH_HELP = "Branch to compare"
@@ -24,9 +25,11 @@ IGNORE_STAGED_HELP = "Ignores staged changes"
 IGNORE_UNSTAGED_HELP = "Ignores unstaged changes"
 EXCLUDE_HELP = "Exclude files, more patterns supported"
 SRC_ROOTS_HELP = "List of source directories (only for jacoco coverage reports)"
-COVERAGE_XML_HELP = "XML coverage report"
+COVERAGE_XML_HELP = "XML or LCOV (.info, .lcov) coverage report, optionally compressed (.gz, .bz2, .xz, .zst)"
 DIFF_RANGE_NOTATION_HELP = "Git diff range notation to use when comparing branches, defaults to '...'"
 
+LCOV_EXTENSIONS = ('.info', '.lcov')
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -132,7 +135,12 @@ def parse_coverage_args(argv):
         version='diff-cover {}'.format(VERSION)
     )
 
-    return vars(parser.parse_args(argv))
+    args = parser.parse_args(argv)
+    lcov_paths = [path for path in args.coverage_xml if _is_lcov_report(path)]
+    if lcov_paths and len(lcov_paths) != len(args.coverage_xml):
+        parser.error("LCOV tracefiles cannot be combined with XML coverage reports")
+
+    return vars(args)
 
 
 def generate_coverage_report(coverage_xml, compare_branch,
@@ -147,9 +155,38 @@ def generate_coverage_report(coverage_xml, compare_branch,
         ignore_staged=ignore_staged, ignore_unstaged=ignore_unstaged,
         exclude=exclude)
 
-    xml_roots = [cElementTree.parse(xml_root) for xml_root in coverage_xml]
+    lcov_paths = [path for path in coverage_xml if _is_lcov_report(path)]
+    if lcov_paths:
+        if len(lcov_paths) != len(coverage_xml):
+            raise ValueError("LCOV tracefiles cannot be combined with XML coverage reports")
+        lcov_roots = [open_report(path) for path in lcov_paths]
+        try:
+            coverage = LcovCoverageReporter(lcov_roots)
+            return _generate_report(coverage, diff, html_report, css_file)
+        finally:
+            for lcov_root in lcov_roots:
+                lcov_root.close()
+
+    xml_roots = []
+    for xml_path in coverage_xml:
+        with open_report(xml_path) as xml_file:
+            xml_roots.append(cElementTree.parse(xml_file))
     coverage = XmlCoverageReporter(xml_roots, src_roots)
+    return _generate_report(coverage, diff, html_report, css_file)
+
+
+def _is_lcov_report(path):
+    """
+    Return True if `path` looks like an LCOV tracefile rather than XML.
+    """
+    return os.path.splitext(uncompressed_name(path))[1].lower() in LCOV_EXTENSIONS
 
+
+def _generate_report(coverage, diff, html_report, css_file):
+    """
+    Write the reports for `coverage` over `diff` and return the
+    percentage of changed lines covered.
+    """
     # Build a report generator
     if html_report is not None:
         css_url = css_file
@@ -184,17 +221,21 @@ def main(argv=None, directory=None):
     arg_dict = parse_coverage_args(argv[1:])
     GitPathTool.set_cwd(directory)
     fail_under = arg_dict.get('fail_under')
-    percent_covered = generate_coverage_report(
-        arg_dict['coverage_xml'],
-        arg_dict['compare_branch'],
-        html_report=arg_dict['html_report'],
-        css_file=arg_dict['external_css_file'],
-        ignore_staged=arg_dict['ignore_staged'],
-        ignore_unstaged=arg_dict['ignore_unstaged'],
-        exclude=arg_dict['exclude'],
-        src_roots=arg_dict['src_roots'],
-        diff_range_notation=arg_dict['diff_range_notation']
-    )
+    try:
+        percent_covered = generate_coverage_report(
+            arg_dict['coverage_xml'],
+            arg_dict['compare_branch'],
+            html_report=arg_dict['html_report'],
+            css_file=arg_dict['external_css_file'],
+            ignore_staged=arg_dict['ignore_staged'],
+            ignore_unstaged=arg_dict['ignore_unstaged'],
+            exclude=arg_dict['exclude'],
+            src_roots=arg_dict['src_roots'],
+            diff_range_notation=arg_dict['diff_range_notation']
+        )
+    except ReportError as error:
+        LOGGER.error(six.text_type(error))
+        return 1
 
     if percent_covered >= fail_under:
         return 0
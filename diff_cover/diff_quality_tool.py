@@ -5,27 +5,37 @@ from __future__ import unicode_literals
 
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
+from multiprocessing.pool import ThreadPool
 
 import six
 
 import diff_cover
+from diff_cover.compression import ReportError, open_report
 from diff_cover.diff_cover_tool import COMPARE_BRANCH_HELP, DIFF_RANGE_NOTATION_HELP, FAIL_UNDER_HELP, \
     IGNORE_STAGED_HELP, IGNORE_UNSTAGED_HELP, EXCLUDE_HELP, HTML_REPORT_HELP, CSS_FILE_HELP
 from diff_cover.diff_reporter import GitDiffReporter
 from diff_cover.git_diff import GitDiffTool
 from diff_cover.git_path import GitPathTool
+from diff_cover.result_cache import ResultCache
 from diff_cover.report_generator import (
     HtmlQualityReportGenerator, StringQualityReportGenerator
 )
-from diff_cover.violationsreporters.base import QualityReporter
+from diff_cover.violationsreporters.base import CombinedQualityReporter, QualityReporter
 from diff_cover.violationsreporters.violations_reporter import (
     flake8_driver, pyflakes_driver, PylintDriver,
     jshint_driver, eslint_driver, pydocstyle_driver,
     pycodestyle_driver)
 from diff_cover.violationsreporters.java_violations_reporter import (
     CheckstyleXmlDriver, checkstyle_driver, FindbugsXmlDriver, PmdXmlDriver)
+from diff_cover.violationsreporters.sarif_violations_reporter import SarifDriver
+from diff_cover.violationsreporters.json_violations_reporter import (
+    EslintJsonDriver, Flake8JsonDriver, PylintJsonDriver)
+from diff_cover.violationsreporters.in_process_reporter import (
+    PycodestyleInProcessDriver, PyflakesInProcessDriver, PydocstyleInProcessDriver,
+    PylintInProcessDriver)
 
 QUALITY_DRIVERS = {
     'pycodestyle': pycodestyle_driver,
@@ -38,12 +48,40 @@ QUALITY_DRIVERS = {
     'checkstyle': checkstyle_driver,
     'checkstylexml': CheckstyleXmlDriver(),
     'findbugs': FindbugsXmlDriver(),
-    'pmd': PmdXmlDriver()
+    'pmd': PmdXmlDriver(),
+    'sarif': SarifDriver()
 }
 
-VIOLATION_CMD_HELP = "Which code quality tool to use (%s)" % "/".join(sorted(QUALITY_DRIVERS))
-INPUT_REPORTS_HELP = "Which violations reports to use"
+# Drivers for tools that can report in JSON
+JSON_DRIVERS = {
+    'pylint': PylintJsonDriver(),
+    'eslint': EslintJsonDriver(),
+    'flake8': Flake8JsonDriver(),
+}
+
+# Drivers used instead of the above with --in-process
+IN_PROCESS_DRIVERS = {
+    'pycodestyle': PycodestyleInProcessDriver(),
+    'pyflakes': PyflakesInProcessDriver(),
+    'pydocstyle': PydocstyleInProcessDriver(),
+    'pylint': PylintInProcessDriver(),
+}
+
+VIOLATION_CMD_HELP = "Which code quality tool to use (%s), or a comma separated list of tools" % \
+    "/".join(sorted(QUALITY_DRIVERS))
+INPUT_REPORTS_HELP = "Which violations reports to use, optionally compressed (.gz, .bz2, .xz, .zst)"
 OPTIONS_HELP = "Options to be passed to the violations tool"
+JOBS_HELP = "Number of copies of the violations tool to run at once, defaults to the number of CPUs"
+COMBINE_REPORTS_HELP = "Report the violations of all tools together, instead of in a section per tool"
+TOOL_FAIL_UNDER_HELP = "Returns an error code if a tool's quality score is below this value, " \
+                       "for example pylint=90. Can be given once per tool"
+REPORT_FORMAT_HELP = "Format of the violations tool's output: text, or json (supported by %s). " \
+                     "Defaults to json when the tool supports it, unless reports are given" % \
+    "/".join(sorted(JSON_DRIVERS))
+IN_PROCESS_HELP = "Call %s through their Python APIs instead of running their commands" % \
+    "/".join(sorted(IN_PROCESS_DRIVERS))
+CACHE_DIR_HELP = "Directory in which to cache the violations tool's results, so unchanged files are not checked again"
+SPOOL_OUTPUT_HELP = "Write the violations tool's output to temporary files instead of keeping it in memory"
 
 
 LOGGER = logging.getLogger(__name__)
@@ -114,6 +152,43 @@ def parse_quality_args(argv):
         help=OPTIONS_HELP
     )
 
+    parser.add_argument(
+        '--jobs',
+        metavar='N',
+        type=_positive_int,
+        default=None,
+        help=JOBS_HELP
+    )
+
+    parser.add_argument(
+        '--report-format',
+        choices=['text', 'json'],
+        default=None,
+        help=REPORT_FORMAT_HELP
+    )
+
+    parser.add_argument(
+        '--in-process',
+        action='store_true',
+        default=False,
+        help=IN_PROCESS_HELP
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIRECTORY',
+        type=str,
+        default=None,
+        help=CACHE_DIR_HELP
+    )
+
+    parser.add_argument(
+        '--spool-output',
+        action='store_true',
+        default=False,
+        help=SPOOL_OUTPUT_HELP
+    )
+
     parser.add_argument(
         '--fail-under',
         metavar='SCORE',
@@ -158,9 +233,49 @@ def parse_quality_args(argv):
         version='diff-quality {}'.format(diff_cover.VERSION)
     )
 
+    parser.add_argument(
+        '--combine-reports',
+        action='store_true',
+        default=False,
+        help=COMBINE_REPORTS_HELP
+    )
+
+    parser.add_argument(
+        '--tool-fail-under',
+        metavar='TOOL=SCORE',
+        type=_tool_score,
+        action='append',
+        default=[],
+        help=TOOL_FAIL_UNDER_HELP
+    )
+
     return vars(parser.parse_args(argv))
 
 
+def _positive_int(value):
+    """
+    Parse an argument that must be a whole number of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError("expected a positive integer, got '{}'".format(value))
+    return number
+
+
+def _tool_score(value):
+    """
+    Parse a `TOOL=SCORE` argument into a `(tool, score)` tuple.
+    """
+    tool, _, score = value.partition('=')
+    try:
+        return tool.strip(), float(score)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected TOOL=SCORE, got '{}'".format(value))
+
+
 def generate_quality_report(tool, compare_branch,
                             html_report=None, css_file=None,
                             ignore_staged=False, ignore_unstaged=False,
@@ -174,16 +289,10 @@ def generate_quality_report(tool, compare_branch,
         supported_extensions=tool.driver.supported_extensions,
         exclude=exclude)
 
+    _read_diff(diff, [tool])
+
     if html_report is not None:
-        css_url = css_file
-        if css_url is not None:
-            css_url = os.path.relpath(css_file, os.path.dirname(html_report))
-        reporter = HtmlQualityReportGenerator(tool, diff, css_url=css_url)
-        with open(html_report, "wb") as output_file:
-            reporter.generate_report(output_file)
-        if css_file is not None:
-            with open(css_file, "wb") as output_file:
-                reporter.generate_css(output_file)
+        _generate_html_report(tool, diff, html_report, css_file)
 
     # Generate the report for stdout
     reporter = StringQualityReportGenerator(tool, diff)
@@ -193,6 +302,139 @@ def generate_quality_report(tool, compare_branch,
     return reporter.total_percent_covered()
 
 
+def generate_quality_reports(tools, compare_branch,
+                             html_report=None, css_file=None,
+                             ignore_staged=False, ignore_unstaged=False,
+                             exclude=None, diff_range_notation=None,
+                             combine=False):
+    """
+    Generate the quality report for several tools at once.  The tools
+    share one diff and run at the same time.
+
+    The console report has a section per tool, unless `combine` is set.
+    The HTML report always combines the tools.
+
+    Returns a tuple of the overall quality and a list of each tool's
+    quality, in the same order as `tools`.  (Tools' names need not be
+    unique: different drivers for the same tool share its name.)
+    """
+    if any(tool.driver.supported_extensions is None for tool in tools):
+        # One of the tools checks every file
+        supported_extensions = None
+    else:
+        supported_extensions = sorted({
+            extension for tool in tools for extension in tool.driver.supported_extensions
+        })
+    diff = GitDiffReporter(
+        compare_branch, git_diff=GitDiffTool(diff_range_notation),
+        ignore_staged=ignore_staged, ignore_unstaged=ignore_unstaged,
+        supported_extensions=supported_extensions,
+        exclude=exclude)
+
+    # Read the diff before the tools share it between threads
+    _read_diff(diff, tools)
+
+    reporters = [StringQualityReportGenerator(tool, diff) for tool in tools]
+
+    # Computing the score runs the tool, which is the slow part
+    pool = ThreadPool(len(reporters))
+    try:
+        tool_percents = pool.map(lambda reporter: reporter.total_percent_covered(), reporters)
+    finally:
+        pool.close()
+        pool.join()
+
+    combined = CombinedQualityReporter(tools)
+    if html_report is not None:
+        _generate_html_report(combined, diff, html_report, css_file)
+
+    output_file = sys.stdout if six.PY2 else sys.stdout.buffer
+    combined_reporter = StringQualityReportGenerator(combined, diff)
+    if combine:
+        combined_reporter.generate_report(output_file)
+    else:
+        for reporter in reporters:
+            reporter.generate_report(output_file)
+
+    return combined_reporter.total_percent_covered(), tool_percents
+
+
+def _read_diff(diff, tools):
+    """
+    Have git work out the diff, checking that the `tools` are installed
+    at the same time, since both mostly mean waiting for other programs.
+    Worker processes that run tools in-process start importing them too.
+
+    Once the diff is known, the rest of the workers are started, while
+    this is the only thread (the tools may then run in threads, and forking
+    while other threads are running can deadlock).
+    """
+    for tool in tools:
+        tool.start_workers()
+    pool = ThreadPool(len(tools))
+    try:
+        probes = pool.map_async(_check_installed, tools)
+        src_paths = diff.src_paths_changed()
+        probes.wait()
+    finally:
+        pool.close()
+        pool.join()
+
+    for tool in tools:
+        tool.start_workers(src_paths)
+
+
+def _check_installed(tool):
+    try:
+        tool.check_installed()
+    except EnvironmentError:
+        # Reported when the tool is run
+        pass
+
+
+def _generate_html_report(tool, diff, html_report, css_file):
+    """
+    Write the HTML report (and external style sheet, if any).
+    """
+    css_url = css_file
+    if css_url is not None:
+        css_url = os.path.relpath(css_file, os.path.dirname(html_report))
+    reporter = HtmlQualityReportGenerator(tool, diff, css_url=css_url)
+    with open(html_report, "wb") as output_file:
+        reporter.generate_report(output_file)
+    if css_file is not None:
+        with open(css_file, "wb") as output_file:
+            reporter.generate_css(output_file)
+
+
+def _drivers(tool, in_process=False, report_format=None, reports_given=False):
+    """
+    Return a tuple of the driver for `tool` and the driver to fall back on
+    if its tool is not installed (or None).
+
+    If `in_process` is set, prefer a driver that calls the tool's Python
+    API.  Otherwise use the JSON driver if `report_format` is json, or if
+    it is not given, the tool can report in JSON and we are running
+    the tool rather than reading (text) reports.  Whether the JSON
+    driver's tool is installed is only found out later (see
+    `QualityReporter.check_installed()`), while git works out the diff.
+    """
+    if in_process and tool in IN_PROCESS_DRIVERS:
+        return IN_PROCESS_DRIVERS[tool], None
+    if report_format == 'json':
+        return JSON_DRIVERS[tool], None
+    if report_format is None and not reports_given and tool in JSON_DRIVERS:
+        return JSON_DRIVERS[tool], QUALITY_DRIVERS[tool]
+    return QUALITY_DRIVERS[tool], None
+
+
+def _cpu_count():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
 def main(argv=None, directory=None):
     """
     Main entry point for the tool, used by setup.py
@@ -215,49 +457,95 @@ def main(argv=None, directory=None):
         last_char = user_options[-1]
         if first_char == last_char and first_char in ('"', "'"):
             user_options = user_options[1:-1]
-    driver = QUALITY_DRIVERS.get(tool)
-
-    if driver is not None:
-        # If we've been given pre-generated reports,
-        # try to open the files
-        input_reports = []
-
-        for path in arg_dict['input_reports']:
-            try:
-                input_reports.append(open(path, 'rb'))
-            except IOError:
-                LOGGER.warning("Could not load '{}'".format(path))
+
+    tools = [name.strip() for name in tool.split(',')]
+    for name in tools:
+        if name not in QUALITY_DRIVERS:
+            LOGGER.error("Quality tool not recognized: '{}'".format(name))
+            return 1
+    for name, _ in arg_dict['tool_fail_under']:
+        if name not in tools:
+            LOGGER.error("Quality tool not selected: '{}'".format(name))
+            return 1
+    if arg_dict['report_format'] == 'json':
+        for name in tools:
+            if name not in JSON_DRIVERS:
+                LOGGER.error("Quality tool does not support JSON reports: '{}'".format(name))
+                return 1
+    if len(tools) > 1 and (arg_dict['input_reports'] or user_options):
+        LOGGER.error("Reports and options can only be given for a single quality tool")
+        return 1
+
+    # If we've been given pre-generated reports,
+    # try to open the files
+    input_reports = []
+
+    for path in arg_dict['input_reports']:
         try:
-            reporter = QualityReporter(driver, input_reports, user_options)
+            input_reports.append(open_report(path))
+        except IOError:
+            LOGGER.warning("Could not load '{}'".format(path))
+    cache = None
+    if arg_dict['cache_dir'] is not None:
+        cache = ResultCache(arg_dict['cache_dir'])
+
+    # Share the CPUs between the tools, which run at the same time
+    jobs = max((arg_dict['jobs'] or _cpu_count()) // len(tools), 1)
+
+    reporters = []
+    try:
+        for name in tools:
+            driver, fallback_driver = _drivers(name, arg_dict['in_process'], arg_dict['report_format'],
+                                               reports_given=bool(arg_dict['input_reports']))
+            reporters.append(QualityReporter(driver, input_reports, user_options, jobs=jobs, cache=cache,
+                                             spool=arg_dict['spool_output'], fallback_driver=fallback_driver))
+        report_kwargs = dict(
+            html_report=arg_dict['html_report'],
+            css_file=arg_dict['external_css_file'],
+            ignore_staged=arg_dict['ignore_staged'],
+            ignore_unstaged=arg_dict['ignore_unstaged'],
+            exclude=arg_dict['exclude'],
+            diff_range_notation=arg_dict['diff_range_notation'],
+        )
+        if len(reporters) == 1:
             percent_passing = generate_quality_report(
-                reporter,
-                arg_dict['compare_branch'],
-                html_report=arg_dict['html_report'],
-                css_file=arg_dict['external_css_file'],
-                ignore_staged=arg_dict['ignore_staged'],
-                ignore_unstaged=arg_dict['ignore_unstaged'],
-                exclude=arg_dict['exclude'],
-                diff_range_notation=arg_dict['diff_range_notation'],
+                reporters[0], arg_dict['compare_branch'], **report_kwargs
             )
-            if percent_passing >= fail_under:
-                return 0
-            else:
-                LOGGER.error("Failure. Quality is below {}%.".format(fail_under))
-                return 1
-
-        except (ImportError, EnvironmentError):
-            LOGGER.error(
-                "Quality tool not installed: '{}'".format(tool)
+            tool_percents = {tools[0]: percent_passing}
+        else:
+            percent_passing, reporter_percents = generate_quality_reports(
+                reporters, arg_dict['compare_branch'],
+                combine=arg_dict['combine_reports'], **report_kwargs
             )
-            return 1
-        # Close any reports we opened
-        finally:
-            for file_handle in input_reports:
-                file_handle.close()
+            # Keyed on the names given on the command line, which
+            # are unique, unlike the names of the drivers
+            tool_percents = dict(zip(tools, reporter_percents))
+
+        exit_code = 0
+        for name, tool_fail_under in arg_dict['tool_fail_under']:
+            if tool_percents[name] < tool_fail_under:
+                LOGGER.error("Failure. {} quality is below {}%.".format(name, tool_fail_under))
+                exit_code = 1
+        if percent_passing < fail_under:
+            LOGGER.error("Failure. Quality is below {}%.".format(fail_under))
+            exit_code = 1
+        return exit_code
+
+    except ReportError as error:
+        LOGGER.error(six.text_type(error))
+        return 1
 
-    else:
-        LOGGER.error("Quality tool not recognized: '{}'".format(tool))
+    except (ImportError, EnvironmentError):
+        LOGGER.error(
+            "Quality tool not installed: '{}'".format(tool)
+        )
         return 1
+    # Close any reports we opened, and stop any workers we started
+    finally:
+        for file_handle in input_reports:
+            file_handle.close()
+        for reporter in reporters:
+            reporter.close()
 
 
 if __name__ == "__main__":
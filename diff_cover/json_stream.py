@@ -0,0 +1,190 @@
+"""
+Read the items of large JSON documents (such as linter reports) one at
+a time, without loading the whole document.
+"""
+from __future__ import unicode_literals
+
+import json
+import re
+
+_WHITESPACE = re.compile(r'\s*')
+
+# The characters that matter when skipping over a value
+_STRUCTURE = re.compile(r'["\[\]{}]')
+
+# The rest of a string, up to its closing quote (or the end of the buffer)
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+# Characters that can follow the start of a number, which may go on
+# in the next chunk even where decoding it stopped (as in `-2500.`)
+_NUMBER_TAIL = re.compile(r'[0-9+\-.eE]*')
+
+# Matches any item of an array, or any value of an object
+WILDCARD = '*'
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader(object):
+    """
+    Decodes JSON from an iterable of text chunks, reading
+    more of them only when the buffer runs out.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+
+    def _read_more(self, at_least=1):
+        """
+        Append chunks to the buffer until at least `at_least` characters
+        have been added, dropping whatever has been consumed.  Return False
+        if there are no more chunks.
+        """
+        pieces, added = [self._buffer[self._pos:]], 0
+        for chunk in self._chunks:
+            pieces.append(chunk)
+            added += len(chunk)
+            if added >= at_least:
+                break
+        else:
+            self._exhausted = True
+        if not added:
+            return False
+        self._buffer = ''.join(pieces)
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """
+        Return the next non-whitespace character, or '' at the end of the input.
+        """
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, char):
+        """
+        Consume `char`, which must be the next non-whitespace character.
+        """
+        if self.peek() != char:
+            raise ValueError("Expected '{}' in JSON".format(char))
+        self._pos += 1
+
+    def value(self):
+        """
+        Decode and consume the next value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # The value may continue in the next chunks.  Decoding starts
+                # again from the beginning of the value, so at least double
+                # what there is of it, to keep the total work linear.
+                if not self._read_more(len(self._buffer) - self._pos):
+                    raise
+                continue
+            # A number at the end of the buffer may continue too
+            at_end = _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)
+            if at_end and self._buffer[self._pos] in '-0123456789' and self._read_more():
+                continue
+            self._pos = end
+            return value
+
+    def skip(self):
+        """
+        Consume the next value without decoding it, which is much quicker
+        for large arrays, objects and strings.
+        """
+        if self.peek() not in ('[', '{', '"'):
+            # Numbers, true, false and null are short
+            self.value()
+            return
+
+        depth, in_string = 0, False
+        while True:
+            if in_string:
+                end = _STRING_BODY.match(self._buffer, self._pos).end()
+                if end < len(self._buffer) and self._buffer[end] == '"':
+                    self._pos, in_string = end + 1, False
+                    if depth == 0:
+                        return
+                    continue
+                # The string continues in the next chunk
+                self._pos = end
+            else:
+                match = _STRUCTURE.search(self._buffer, self._pos)
+                if match is not None:
+                    self._pos = match.end()
+                    char = match.group()
+                    if char == '"':
+                        in_string = True
+                    elif char in '[{':
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            return
+                    continue
+                self._pos = len(self._buffer)
+            if not self._read_more():
+                raise ValueError("Unterminated value in JSON")
+
+
+def iter_json(chunks, path):
+    """
+    Yield the values found at `path` in the JSON document made up of the
+    text in `chunks`, decoding one value at a time.  Reading is quickest
+    when the chunks are large (see `report_chunks()`), rather than lines.
+
+    `path` is a list of object keys and `WILDCARD`s, which match every item
+    of an array or value of an object.  For example, `['runs', '*']` yields
+    each run in a SARIF log.  Parts of the document that do not lead to
+    `path` are skipped.  An empty document yields nothing.
+    """
+    reader = _Reader(chunks)
+    if reader.peek() == '':
+        return iter(())
+    return _walk(reader, list(path))
+
+
+def _walk(reader, path):
+    if not path:
+        yield reader.value()
+        return
+
+    key, rest = path[0], path[1:]
+    opening = reader.peek()
+    if opening not in ('[', '{') or (opening == '[' and key != WILDCARD):
+        # The document does not have the expected shape here
+        reader.skip()
+        return
+
+    closing = ']' if opening == '[' else '}'
+    reader.expect(opening)
+    if reader.peek() == closing:
+        reader.expect(closing)
+        return
+
+    while True:
+        if opening == '{':
+            item_key = reader.value()
+            reader.expect(':')
+        if opening == '[' or key in (WILDCARD, item_key):
+            for value in _walk(reader, rest):
+                yield value
+        else:
+            reader.skip()
+
+        if reader.peek() == ',':
+            reader.expect(',')
+        else:
+            reader.expect(closing)
+            return
@@ -3,6 +3,7 @@ Classes for generating diff coverage reports.
 """
 from __future__ import unicode_literals
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, bisect_right
 from jinja2 import Environment, PackageLoader
 from jinja2_pluralize import pluralize_dj
 from diff_cover.snippets import Snippet
@@ -14,14 +15,18 @@ class DiffViolations(object):
     Class to capture violations generated by a particular diff
     """
     def __init__(self, violations, measured_lines, diff_lines):
-        self.lines = {
-            violation.line for violation in violations
-        }.intersection(diff_lines)
-
-        self.violations = {
-            violation for violation in violations
-            if violation.line in self.lines
-        }
+        self.lines = set()
+        self.violations = set()
+
+        # Find the changed lines in the range of each violation,
+        # without visiting the lines in the range that did not change
+        sorted_lines = sorted(set(diff_lines))
+        for violation in violations:
+            index = bisect_left(sorted_lines, violation.line)
+            end = bisect_right(sorted_lines, violation.end_line, index)
+            if index < end:
+                self.lines.update(sorted_lines[index:end])
+                self.violations.add(violation)
 
         # By convention, a violation reporter
         # can return `None` to indicate that all lines are "measured"
@@ -166,13 +171,21 @@ class BaseReportGenerator(object):
         To make this efficient, we cache and reuse the result.
         """
         if not self._diff_violations_dict:
+            changed_lines = {
+                src_path: self._diff.lines_changed(src_path)
+                for src_path in self._diff.src_paths_changed()
+            }
+
+            # Let the reporter skip anything the diff did not touch
+            self._violations.set_changed_lines(changed_lines)
+
             self._diff_violations_dict = {
                     src_path: DiffViolations(
                         self._violations.violations(src_path),
                         self._violations.measured_lines(src_path),
-                        self._diff.lines_changed(src_path),
+                        lines,
                     )
-                 for src_path in self._diff.src_paths_changed()
+                 for src_path, lines in changed_lines.items()
             }
         return self._diff_violations_dict
 
@@ -0,0 +1,177 @@
+"""
+Persistent cache of quality tool results, so that files which have not
+changed since the last run do not need to be checked again.
+"""
+from __future__ import unicode_literals
+
+import hashlib
+import json
+import os
+import tempfile
+
+import six
+
+# Bump this whenever the format of cached entries changes
+CACHE_FORMAT = 1
+
+# Default bound on the total size of the cache directory (in bytes)
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+ENTRY_EXTENSION = '.json'
+
+
+def _digest(parts):
+    """
+    Return a hex digest identifying the sequence of strings `parts`.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, six.text_type):
+            part = part.encode('utf-8')
+        digest.update(part)
+        # Separate the parts so that ('ab', 'c') and ('a', 'bc') differ
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    """
+    Return a hex digest of the contents of the file at `path`,
+    or None if the file cannot be read.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as source:
+            for block in iter(lambda: source.read(65536), b''):
+                digest.update(block)
+    except (IOError, OSError):
+        return None
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """
+    Stores the violations found in each source file in `directory`, one
+    JSON file per entry.
+
+    Entries are keyed on a digest of the tool configuration (see
+    `tool_key()`) together with the path and contents of the source file,
+    so changing any of them is enough to invalidate the entry.  When the
+    directory grows beyond `max_size` bytes, the least recently used
+    entries are removed.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def tool_key(*parts):
+        """
+        Return a key identifying a tool configuration made up of `parts`,
+        such as the tool's name, version and options.  None parts are allowed.
+        """
+        return _digest(
+            [six.text_type(CACHE_FORMAT)] +
+            ['' if part is None else six.text_type(part) for part in parts]
+        )
+
+    @staticmethod
+    def entry_key(tool_key, src_path, contents_digest):
+        """
+        Return the key of the entry for the source file at `src_path`.
+        """
+        return _digest([tool_key, src_path, contents_digest])
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ENTRY_EXTENSION)
+
+    def get(self, key):
+        """
+        Return the list of violations stored under `key` (as lists of
+        `Violation` fields), or None if there is no such entry.
+        """
+        return self.load(key)
+
+    def set(self, key, violations):
+        """
+        Store the list `violations` under `key`.
+        """
+        self.store(key, [list(violation) for violation in violations])
+
+    def load(self, key):
+        """
+        Return the value stored under `key`, or None if there is no such entry.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as entry:
+                value = json.loads(entry.read().decode('utf-8'))
+        except (IOError, OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return value
+
+    def store(self, key, value):
+        """
+        Store `value`, which must be serializable as JSON, under `key`.
+
+        Failing to write the cache is not an error: the value
+        will simply be worked out again next time.
+        """
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+
+            # Write to a temporary file first, so that concurrent runs
+            # never see a partially written entry
+            handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as entry:
+                entry.write(json.dumps(value).encode('utf-8'))
+
+            path = self._entry_path(key)
+            try:
+                os.rename(temp_path, path)
+            except OSError:
+                # Windows refuses to rename over an existing file
+                os.remove(temp_path)
+        except (IOError, OSError):
+            pass
+
+    def prune(self):
+        """
+        Remove the least recently used entries until the
+        cache is no larger than `max_size` bytes.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        entries = []
+        total_size = 0
+        for name in names:
+            if not name.endswith(ENTRY_EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
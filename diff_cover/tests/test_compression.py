@@ -0,0 +1,85 @@
+from __future__ import unicode_literals
+
+import bz2
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from diff_cover import compression
+from diff_cover.compression import ReportError, open_report, uncompressed_name
+
+
+class OpenReportTest(unittest.TestCase):
+
+    CONTENTS = b'line one\nline two\n'
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(lambda: shutil.rmtree(self.temp_dir))
+
+    def _write(self, name, opener=open):
+        path = os.path.join(self.temp_dir, name)
+        with opener(path, 'wb') as report:
+            report.write(self.CONTENTS)
+        return path
+
+    def _assert_reads_back(self, path):
+        report = open_report(path)
+        try:
+            self.assertEqual(list(report), [b'line one\n', b'line two\n'])
+        finally:
+            report.close()
+
+    def test_uncompressed(self):
+        self._assert_reads_back(self._write('report.txt'))
+
+    def test_gzip(self):
+        self._assert_reads_back(self._write('report.txt.gz', gzip.open))
+
+    def test_bz2(self):
+        self._assert_reads_back(self._write('report.txt.bz2', bz2.BZ2File))
+
+    @unittest.skipIf(compression.lzma is None, "lzma is not available")
+    def test_xz(self):
+        self._assert_reads_back(self._write('report.txt.xz', compression.lzma.open))
+
+    def test_missing_decompressor(self):
+        path = self._write('report.txt.zst')
+        with mock.patch.object(compression, 'zstandard', None):
+            with self.assertRaises(IOError):
+                open_report(path)
+
+    def test_corrupt(self):
+        # Not compressed the way its extension says
+        for name in ('report.txt.gz', 'report.txt.bz2'):
+            report = open_report(self._write(name))
+            try:
+                with self.assertRaises(ReportError):
+                    list(report)
+            finally:
+                report.close()
+
+        # Not an EnvironmentError, which would mean the tool is not installed
+        self.assertFalse(issubclass(ReportError, EnvironmentError))
+
+    def test_truncated(self):
+        path = self._write('report.txt.gz', gzip.open)
+        with open(path, 'rb') as report:
+            contents = report.read()
+        with open(path, 'wb') as report:
+            report.write(contents[:-10])
+        report = open_report(path)
+        try:
+            with self.assertRaises(ReportError):
+                report.read()
+        finally:
+            report.close()
+
+    def test_uncompressed_name(self):
+        self.assertEqual(uncompressed_name('coverage.xml.gz'), 'coverage.xml')
+        self.assertEqual(uncompressed_name('lcov.info.XZ'), 'lcov.info')
+        self.assertEqual(uncompressed_name('coverage.xml'), 'coverage.xml')
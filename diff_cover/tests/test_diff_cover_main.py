@@ -31,3 +31,16 @@ class TestParseCoverArgsTest:
         assert e.value.code == 2
         _, err = capsys.readouterr()
         assert "invalid choice: 'FOO'" in err
+
+    def test_parse_mixed_lcov_and_xml(self, capsys):
+        argv = ['build/tests/coverage.xml', 'build/tests/coverage.info']
+
+        with pytest.raises(SystemExit) as e:
+            parse_coverage_args(argv)
+
+        assert e.value.code == 2
+        _, err = capsys.readouterr()
+        assert "LCOV tracefiles cannot be combined with XML coverage reports" in err
+
+        arg_dict = parse_coverage_args(['build/tests/coverage.info', 'build/tests/other.info'])
+        assert arg_dict['coverage_xml'] == ['build/tests/coverage.info', 'build/tests/other.info']
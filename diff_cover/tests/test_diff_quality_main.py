@@ -1,10 +1,18 @@
 from __future__ import unicode_literals
 
+import threading
 import unittest
+from textwrap import dedent
 
-from mock import patch
+from mock import Mock, patch
+from six import BytesIO
 
-from diff_cover.diff_quality_tool import parse_quality_args, main
+from diff_cover.compression import ReportError
+from diff_cover.diff_quality_tool import parse_quality_args, main, generate_quality_reports
+from diff_cover.violationsreporters.base import InProcessDriver, QualityReporter
+from diff_cover.violationsreporters.in_process_reporter import PylintInProcessDriver
+from diff_cover.violationsreporters.json_violations_reporter import PylintJsonDriver
+from diff_cover.violationsreporters.violations_reporter import eslint_driver, pycodestyle_driver, PylintDriver
 
 
 class ParseQualityArgsTest(unittest.TestCase):
@@ -59,6 +67,35 @@ class ParseQualityArgsTest(unittest.TestCase):
             '"--exclude=\'*/migrations*\'"'
         )
 
+    def test_parse_with_jobs(self):
+        arg_dict = parse_quality_args(['--violations', 'pylint'])
+        self.assertIsNone(arg_dict.get('jobs'))
+
+        arg_dict = parse_quality_args(['--violations', 'pylint', '--jobs', '4'])
+        self.assertEqual(arg_dict.get('jobs'), 4)
+
+        for jobs in ('0', '-3', 'many'):
+            with patch('sys.stderr'), self.assertRaises(SystemExit):
+                parse_quality_args(['--violations', 'pylint', '--jobs', jobs])
+
+    def test_parse_with_tool_fail_under(self):
+        arg_dict = parse_quality_args(['--violations', 'pylint,flake8'])
+        self.assertEqual(arg_dict.get('tool_fail_under'), [])
+        self.assertFalse(arg_dict.get('combine_reports'))
+
+        arg_dict = parse_quality_args([
+            '--violations', 'pylint,flake8',
+            '--tool-fail-under', 'pylint=90',
+            '--tool-fail-under', 'flake8=100',
+            '--combine-reports',
+        ])
+        self.assertEqual(arg_dict.get('tool_fail_under'), [('pylint', 90.0), ('flake8', 100.0)])
+        self.assertTrue(arg_dict.get('combine_reports'))
+
+    def test_parse_invalid_tool_fail_under(self):
+        with self.assertRaises(SystemExit):
+            parse_quality_args(['--violations', 'pylint', '--tool-fail-under', 'pylint'])
+
     def test_parse_with_ignored_unstaged(self):
         argv = ['--violations', 'pylint', '--ignore-unstaged']
 
@@ -118,7 +155,7 @@ class MainTest(unittest.TestCase):
             "--violations", "pylint",
             '--options="--foobar"',
         ]
-        self._run_main(argv)
+        assert self._run_main(argv).options == '--foobar'
 
     def test_parse_options_without_quotes(self):
         argv = [
@@ -126,7 +163,136 @@ class MainTest(unittest.TestCase):
             "--violations", "pylint",
             '--options=--foobar',
         ]
-        self._run_main(argv)
+        assert self._run_main(argv).options == '--foobar'
+
+    def test_jobs(self):
+        argv = [
+            "diff-quality",
+            "--violations", "pylint",
+            "--jobs", "3",
+        ]
+        quality_reporter = self._run_main(argv)
+        assert quality_reporter.jobs == 3
+
+    def test_jobs_defaults_to_cpu_count(self):
+        with patch("diff_cover.diff_quality_tool.multiprocessing.cpu_count", return_value=6):
+            quality_reporter = self._run_main(["diff-quality", "--violations", "pylint"])
+        assert quality_reporter.jobs == 6
+
+    def test_cache_dir(self):
+        assert self._run_main(["diff-quality", "--violations", "pylint"]).cache is None
+
+        quality_reporter = self._run_main([
+            "diff-quality",
+            "--violations", "pylint",
+            "--cache-dir", "/tmp/quality-cache",
+        ])
+        assert quality_reporter.cache.directory == "/tmp/quality-cache"
+
+    def test_spool_output(self):
+        assert not self._run_main(["diff-quality", "--violations", "pylint"]).spool
+        assert self._run_main(["diff-quality", "--violations", "pylint", "--spool-output"]).spool
+
+    def test_in_process(self):
+        quality_reporter = self._run_main(["diff-quality", "--violations", "pylint", "--in-process"])
+        assert isinstance(quality_reporter.driver, PylintInProcessDriver)
+
+        quality_reporter = self._run_main(["diff-quality", "--violations", "pylint"])
+        assert not isinstance(quality_reporter.driver, InProcessDriver)
+
+    def test_report_format(self):
+        with patch.object(PylintJsonDriver, 'installed', return_value=True):
+            # JSON by default when the tool supports it
+            quality_reporter = self._run_main(["diff-quality", "--violations", "pylint"])
+            assert isinstance(quality_reporter.driver, PylintJsonDriver)
+
+            quality_reporter = self._run_main(["diff-quality", "--violations", "pylint", "--report-format=text"])
+            assert not isinstance(quality_reporter.driver, PylintJsonDriver)
+
+            # Pre-generated reports are text unless we are told otherwise
+            with patch("diff_cover.diff_quality_tool.open_report"):
+                quality_reporter = self._run_main(["diff-quality", "--violations", "pylint", "report.txt"])
+                assert not isinstance(quality_reporter.driver, PylintJsonDriver)
+
+                quality_reporter = self._run_main(["diff-quality", "--violations", "pylint",
+                                                   "--report-format=json", "report.json"])
+                assert isinstance(quality_reporter.driver, PylintJsonDriver)
+
+        with patch.object(PylintJsonDriver, 'installed', return_value=False):
+            # The text driver is used once we know the JSON one cannot be
+            quality_reporter = self._run_main(["diff-quality", "--violations", "pylint"])
+            assert isinstance(quality_reporter.driver, PylintJsonDriver)
+            with patch.object(PylintDriver, 'installed', return_value=True):
+                quality_reporter.check_installed()
+            assert not isinstance(quality_reporter.driver, PylintJsonDriver)
+            assert quality_reporter.driver_tool_installed
+
+    def test_report_format_unsupported(self):
+        with patch("diff_cover.diff_quality_tool.LOGGER") as logger:
+            self.assertEqual(main(["diff-quality", "--violations", "pycodestyle", "--report-format=json"]), 1)
+            logger.error.assert_called_with("Quality tool does not support JSON reports: 'pycodestyle'")
+
+    def test_corrupt_report(self):
+        with patch("diff_cover.diff_quality_tool.open_report"), \
+                patch("diff_cover.diff_quality_tool.generate_quality_report",
+                      side_effect=ReportError("Could not decompress 'report.txt.gz'")), \
+                patch("diff_cover.diff_quality_tool.LOGGER") as logger:
+            self.assertEqual(main(["diff-quality", "--violations", "pycodestyle", "report.txt.gz"]), 1)
+            logger.error.assert_called_with("Could not decompress 'report.txt.gz'")
+
+    def test_multiple_tools(self):
+        argv = [
+            "diff-quality",
+            "--violations", "pylint, flake8",
+            "--jobs", "4",
+        ]
+        with patch("diff_cover.diff_quality_tool.generate_quality_reports",
+                   return_value=(80, [70, 90])) as gen_reports:
+            self.assertEqual(main(argv), 0)
+
+            reporters = gen_reports.call_args[0][0]
+            self.assertEqual([reporter.driver.name for reporter in reporters], ['pylint', 'flake8'])
+            # The tools share the CPUs
+            self.assertEqual([reporter.jobs for reporter in reporters], [2, 2])
+            self.assertFalse(gen_reports.call_args[1]['combine'])
+
+            self.assertEqual(main(argv + ['--fail-under', '80']), 0)
+            self.assertEqual(main(argv + ['--fail-under', '81']), 1)
+            self.assertEqual(main(argv + ['--tool-fail-under', 'flake8=90']), 0)
+            self.assertEqual(main(argv + ['--tool-fail-under', 'pylint=75']), 1)
+
+    def test_tool_fail_under_same_driver_name(self):
+        # Both drivers are named checkstyle
+        argv = ["diff-quality", "--violations", "checkstyle,checkstylexml"]
+        with patch("diff_cover.diff_quality_tool.generate_quality_reports",
+                   return_value=(80, [90, 70])) as gen_reports:
+            self.assertEqual(main(argv + ['--tool-fail-under', 'checkstyle=90']), 0)
+            self.assertEqual(main(argv + ['--tool-fail-under', 'checkstylexml=70']), 0)
+            self.assertEqual(main(argv + ['--tool-fail-under', 'checkstylexml=71']), 1)
+            self.assertEqual(
+                [reporter.driver.name for reporter in gen_reports.call_args[0][0]],
+                ['checkstyle', 'checkstyle']
+            )
+
+    def test_tool_fail_under_single_tool(self):
+        argv = ["diff-quality", "--violations", "pylint"]
+        with patch("diff_cover.diff_quality_tool.generate_quality_report", return_value=70):
+            self.assertEqual(main(argv + ['--tool-fail-under', 'pylint=70']), 0)
+            self.assertEqual(main(argv + ['--tool-fail-under', 'pylint=71']), 1)
+
+    def test_multiple_tools_errors(self):
+        with patch("diff_cover.diff_quality_tool.generate_quality_reports") as gen_reports:
+            with patch("diff_cover.diff_quality_tool.LOGGER") as logger:
+                self.assertEqual(main(["diff-quality", "--violations", "pylint,garbage"]), 1)
+                logger.error.assert_called_with("Quality tool not recognized: 'garbage'")
+
+                self.assertEqual(main(["diff-quality", "--violations", "pylint",
+                                       "--tool-fail-under", "flake8=90"]), 1)
+                logger.error.assert_called_with("Quality tool not selected: 'flake8'")
+
+                self.assertEqual(main(["diff-quality", "--violations", "pylint,flake8",
+                                       "--options=--foobar"]), 1)
+            self.assertFalse(gen_reports.called)
 
     def _run_main(self, argv):
         gen_report_patch = patch("diff_cover.diff_quality_tool.generate_quality_report",
@@ -135,4 +301,79 @@ class MainTest(unittest.TestCase):
             main(argv)
             quality_reporter = p.call_args[0][0]
             assert quality_reporter.driver.name == 'pylint'
-            assert quality_reporter.options == '--foobar'
+            return quality_reporter
+
+
+class GenerateQualityReportsTest(unittest.TestCase):
+    """Tests for reporting several tools at once"""
+
+    def setUp(self):
+        diff = Mock()
+        diff.name.return_value = 'master...HEAD'
+        diff.src_paths_changed.return_value = ['file.py', 'file.js']
+        diff.lines_changed.side_effect = lambda src_path: [1, 2]
+        self.diff_reporter = patch("diff_cover.diff_quality_tool.GitDiffReporter", return_value=diff).start()
+        self.stdout = BytesIO()
+        mock_sys = patch("diff_cover.diff_quality_tool.sys").start()
+        mock_sys.stdout = mock_sys.stdout.buffer = self.stdout
+        self.addCleanup(patch.stopall)
+
+        self.tools = [
+            QualityReporter(pycodestyle_driver, reports=[BytesIO(b'file.py:1:1: E225 whitespace\n')]),
+            QualityReporter(eslint_driver, reports=[BytesIO(b'file.js: line 2, col 1, Missing semicolon\n')]),
+        ]
+
+    def test_sections_per_tool(self):
+        percent, tool_percents = generate_quality_reports(self.tools, 'master')
+
+        self.assertEqual(percent, 50)
+        self.assertEqual(tool_percents, [50, 50])
+
+        # One diff covers the files of both tools
+        self.assertEqual(self.diff_reporter.call_count, 1)
+        self.assertEqual(
+            self.diff_reporter.call_args[1]['supported_extensions'], ['js', 'py']
+        )
+
+        report = self.stdout.getvalue().decode('utf-8')
+        self.assertIn('Quality Report: pycodestyle', report)
+        self.assertIn('Quality Report: eslint', report)
+        self.assertIn('file.py:1: E225 whitespace', report)
+        self.assertIn('file.js:2: Missing semicolon', report)
+
+    def test_tools_checked_with_diff(self):
+        check_installed = patch.object(QualityReporter, 'check_installed').start()
+        generate_quality_reports(self.tools, 'master')
+        self.assertEqual(check_installed.call_count, 2)
+
+    def test_workers_started_before_threads(self):
+        # Forking while tools run in other threads can deadlock
+        threads = []
+
+        def start_workers(src_paths=None):
+            threads.append((threading.current_thread(), src_paths))
+
+        patch.object(QualityReporter, 'start_workers', side_effect=start_workers).start()
+        generate_quality_reports(self.tools, 'master')
+        main_thread = threading.current_thread()
+        self.assertEqual(threads, [(main_thread, None)] * 2 + [(main_thread, ['file.py', 'file.js'])] * 2)
+
+    def test_combined(self):
+        generate_quality_reports(self.tools, 'master', combine=True)
+
+        self.assertEqual(self.stdout.getvalue().decode('utf-8'), dedent("""
+            -------------
+            Diff Quality
+            Quality Report: pycodestyle, eslint
+            Diff: master...HEAD
+            -------------
+            file.js (50.0%):
+            file.js:2: eslint: Missing semicolon
+            file.py (50.0%):
+            file.py:1: pycodestyle: E225 whitespace
+            -------------
+            Total:   4 lines
+            Violations: 2 lines
+            % Quality: 50%
+            -------------
+        """).lstrip())
@@ -0,0 +1,155 @@
+from __future__ import unicode_literals
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from textwrap import dedent
+
+from mock import patch
+
+from diff_cover.violationsreporters.base import QualityReporter, Violation, _import_in_worker, find_spec
+from diff_cover.violationsreporters.in_process_reporter import (
+    PycodestyleInProcessDriver, PyflakesInProcessDriver, PydocstyleInProcessDriver,
+    PylintInProcessDriver)
+
+
+def _requires(module):
+    return unittest.skipIf(find_spec(module) is None, "{} is not installed".format(module))
+
+
+class InProcessDriverTest(unittest.TestCase):
+
+    SOURCE = dedent("""
+        import os
+        def func( arg):
+            return 1
+    """).lstrip()
+
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir)
+        with open('file.py', 'w') as source:
+            source.write(self.SOURCE)
+        with open('other.py', 'w') as source:
+            source.write('"""Docstring."""\nx=1\n')
+
+    @_requires('pycodestyle')
+    def test_pycodestyle(self):
+        violations = PycodestyleInProcessDriver().check(['file.py', 'other.py'], [])
+        self.assertEqual(dict(violations), {
+            'file.py': [
+                Violation(2, 'E302 expected 2 blank lines, found 0'),
+                Violation(2, "E201 whitespace after '('"),
+            ],
+            'other.py': [Violation(2, 'E225 missing whitespace around operator')],
+        })
+
+    @_requires('pycodestyle')
+    def test_pycodestyle_options(self):
+        violations = PycodestyleInProcessDriver().check(['file.py'], ['--ignore=E201,E302'])
+        self.assertEqual(dict(violations), {})
+
+    @_requires('pyflakes')
+    def test_pyflakes(self):
+        violations = PyflakesInProcessDriver().check(['file.py', 'other.py'], [])
+        self.assertEqual(dict(violations), {
+            'file.py': [Violation(1, "'os' imported but unused")],
+        })
+
+    @_requires('pydocstyle')
+    def test_pydocstyle(self):
+        violations = PydocstyleInProcessDriver().check(['file.py', 'other.py'], [])
+        self.assertEqual(dict(violations), {
+            'file.py': [
+                Violation(1, 'D100: Missing docstring in public module'),
+                Violation(2, 'D103: Missing docstring in public function'),
+            ],
+        })
+
+    @_requires('pylint')
+    def test_pylint(self):
+        violations = PylintInProcessDriver().check(['file.py'], ['--disable=all', '--enable=unused-import'])
+        self.assertEqual(dict(violations), {
+            'file.py': [Violation(1, 'W0611: (unused-import), : Unused import os')],
+        })
+
+    @_requires('pycodestyle')
+    def test_quality_reporter_workers(self):
+        quality = QualityReporter(PycodestyleInProcessDriver(), options='--select=E225', jobs=2)
+        self.addCleanup(quality.close)
+        quality.set_changed_lines({'file.py': [1, 2], 'other.py': [2]})
+
+        self.assertEqual(quality.violations('file.py'), [])
+        self.assertEqual(
+            quality.violations('other.py'),
+            [Violation(2, 'E225 missing whitespace around operator')]
+        )
+
+    @_requires('pycodestyle')
+    def test_quality_reporter_workers_reused(self):
+        quality = QualityReporter(PycodestyleInProcessDriver(), options='--select=E225', jobs=2)
+        self.addCleanup(quality.close)
+
+        # Without the diff, each file is checked when it is asked for
+        with patch('diff_cover.violationsreporters.base.multiprocessing.Pool', wraps=multiprocessing.Pool) as pool:
+            self.assertEqual(quality.violations('file.py'), [])
+            self.assertEqual(
+                quality.violations('other.py'),
+                [Violation(2, 'E225 missing whitespace around operator')]
+            )
+        self.assertEqual(pool.call_count, 1)
+
+        quality.close()
+        self.assertEqual(quality._workers, [])
+
+    def test_pylint_checks_files_together(self):
+        # However many jobs there are, so that duplicate code is found
+        quality = QualityReporter(PylintInProcessDriver(), jobs=4)
+        self.assertEqual(quality._shard_count(), 1)
+        self.assertEqual(QualityReporter(PyflakesInProcessDriver(), jobs=4)._shard_count(), 4)
+
+    @_requires('pycodestyle')
+    def test_quality_reporter_workers_added(self):
+        quality = QualityReporter(PycodestyleInProcessDriver(), options='--select=E225', jobs=8)
+        self.addCleanup(quality.close)
+
+        # One worker warms up before the diff is known, and only
+        # as many more are started as there are shards to check
+        quality.start_workers()
+        self.assertEqual([size for _, size in quality._workers], [1])
+        quality.set_changed_lines({'file.py': [1, 2], 'other.py': [2]})
+        self.assertEqual(
+            quality.violations('other.py'),
+            [Violation(2, 'E225 missing whitespace around operator')]
+        )
+        self.assertEqual([size for _, size in quality._workers], [1, 1])
+
+    @_requires('pycodestyle')
+    def test_quality_reporter_workers_for_diff(self):
+        quality = QualityReporter(PycodestyleInProcessDriver(), options='--select=E225', jobs=8)
+        self.addCleanup(quality.close)
+
+        # All the workers the diff needs are started at once, so none
+        # have to be started later, in whichever thread runs the tool
+        quality.start_workers(['file.py', 'other.py', 'README.rst'])
+        self.assertEqual([size for _, size in quality._workers], [2])
+        quality.set_changed_lines({'file.py': [1, 2], 'other.py': [2], 'README.rst': [1]})
+        with patch('diff_cover.violationsreporters.base.multiprocessing.Pool') as pool:
+            self.assertEqual(
+                quality.violations('other.py'),
+                [Violation(2, 'E225 missing whitespace around operator')]
+            )
+        self.assertFalse(pool.called)
+
+    def test_worker_import_error(self):
+        # A worker whose tool is missing still starts
+        _import_in_worker('no_such_quality_tool')
+
+    def test_parse_reports(self):
+        # Pre-generated reports are parsed like the console script's output
+        violations = PyflakesInProcessDriver().parse_reports(["file.py:1: 'os' imported but unused"])
+        self.assertEqual(dict(violations), {'file.py': [Violation(1, "'os' imported but unused")]})
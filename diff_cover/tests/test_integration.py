@@ -3,6 +3,7 @@ High-level integration tests of diff-cover tool.
 """
 from __future__ import unicode_literals
 
+import gzip
 import os
 import os.path
 import re
@@ -26,6 +27,18 @@ from diff_cover.violationsreporters.base import QualityDriver
 from mock import patch, Mock
 
 
+def _gzip_fixture(rel_path):
+    """
+    Write a gzipped copy of a fixture to a temporary directory
+    and return its path.
+    """
+    compressed_path = os.path.join(tempfile.mkdtemp(), rel_path + '.gz')
+    with open(fixture_path(rel_path), 'rb') as fixture:
+        with gzip.open(compressed_path, 'wb') as compressed:
+            shutil.copyfileobj(fixture, compressed)
+    return compressed_path
+
+
 class ToolsIntegrationBase(unittest.TestCase):
     """
     Base class for diff-cover and diff-quality integration tests
@@ -225,6 +238,22 @@ class DiffCoverIntegrationTest(ToolsIntegrationBase):
             ['diff-cover', 'luacoverage.xml']
         )
 
+    def test_added_file_lcov_console(self):
+        self._check_console_report(
+            'git_diff_add.txt',
+            'add_console_report.txt',
+            ['diff-cover', 'lcov.info']
+        )
+
+    def test_added_file_compressed_console(self):
+        compressed_path = _gzip_fixture('coverage.xml')
+        self.addCleanup(lambda: shutil.rmtree(os.path.dirname(compressed_path)))
+        self._check_console_report(
+            'git_diff_add.txt',
+            'add_console_report.txt',
+            ['diff-cover', compressed_path]
+        )
+
     def test_fail_under_console(self):
         self._check_console_report(
             'git_diff_add.txt',
@@ -508,6 +537,15 @@ class DiffQualityIntegrationTest(ToolsIntegrationBase):
             ['diff-quality', '--violations=pycodestyle', 'pycodestyle_report.txt']
         )
 
+    def test_pre_generated_compressed_report(self):
+        compressed_path = _gzip_fixture('pycodestyle_report.txt')
+        self.addCleanup(lambda: shutil.rmtree(os.path.dirname(compressed_path)))
+        self._check_console_report(
+            'git_diff_violations.txt',
+            'pycodestyle_violations_report.txt',
+            ['diff-quality', '--violations=pycodestyle', compressed_path]
+        )
+
     def test_pre_generated_pyflakes_report(self):
 
         # Pass in a pre-generated pyflakes report instead of letting
@@ -237,6 +237,32 @@ class CheckstyleXmlQualityReporterTest(unittest.TestCase):
         for expected in expected_violations:
             self.assertIn(expected, actual_violations)
 
+    def test_quality_pregenerated_report_outside_diff(self):
+        # Files that are not in the diff are skipped, and the
+        # path of each file is only looked up once
+        relative_path = mock.Mock(side_effect=lambda path: path)
+        patch('diff_cover.violationsreporters.java_violations_reporter.GitPathTool.relative_path',
+              relative_path).start()
+        checkstyle_report = dedent("""
+            <?xml version="1.0" encoding="ISO-8859-1"?>
+            <checkstyle version="8.0">
+                <file name="path/to/file.java">
+                    <error line="1" severity="error" message="Café"/>
+                    <error line="2" severity="error" message="Missing docstring"/>
+                </file>
+                <file name="another/file.java">
+                    <error line="1" severity="error" message="Missing docstring"/>
+                </file>
+            </checkstyle>
+        """).strip().encode('utf-8')
+
+        quality = QualityReporter(CheckstyleXmlDriver(), reports=[BytesIO(checkstyle_report)])
+        quality.set_changed_lines({'path/to/file.java': [1]})
+
+        self.assertEqual(quality.violations('path/to/file.java'), [Violation(1, 'error: Café')])
+        self.assertEqual(list(quality.violations_dict), ['path/to/file.java'])
+        self.assertEqual(relative_path.call_count, 2)
+
 
 class FindbugsQualityReporterTest(unittest.TestCase):
 
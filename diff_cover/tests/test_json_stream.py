@@ -0,0 +1,96 @@
+from __future__ import unicode_literals
+
+import json
+import random
+import unittest
+
+import mock
+
+from diff_cover import json_stream
+from diff_cover.json_stream import WILDCARD, iter_json
+
+
+class IterJsonTest(unittest.TestCase):
+
+    DOCUMENT = (
+        '{"version": "2.1", "runs": ['
+        '{"tool": {"name": "x", "rules": [1, 2]}, "results": [{"line": 1}, {"line": 22}]}, '
+        '{"results": []}, '
+        '{"results": [{"line": 3e2, "text": "a \\"quoted\\" ]"}]}'
+        ']}'
+    )
+
+    def test_nested_path(self):
+        # However the document is split, we find the same values
+        for size in (1, 2, 5, len(self.DOCUMENT)):
+            chunks = [self.DOCUMENT[start:start + size] for start in range(0, len(self.DOCUMENT), size)]
+            self.assertEqual(
+                list(iter_json(chunks, ['runs', WILDCARD, 'results', WILDCARD])),
+                [{'line': 1}, {'line': 22}, {'line': 300.0, 'text': 'a "quoted" ]'}]
+            )
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(list(iter_json(['[12', '3, 4', '5]'], [WILDCARD])), [123, 45])
+
+    def test_numbers_split_after_point_or_exponent(self):
+        self.assertEqual(list(iter_json(['[-2500.', '0]'], [WILDCARD])), [-2500.0])
+        self.assertEqual(list(iter_json(['[1, 2', '.5]'], [WILDCARD])), [1, 2.5])
+        self.assertEqual(list(iter_json(['[1e', '-', '2, 3E', '+2]'], [WILDCARD])), [0.01, 300.0])
+
+    def test_random_chunks(self):
+        document = json.dumps({
+            'skip': [{'a': -1.5e-3, 'b': 'x]"y'}, None, True],
+            'keep': [-2500.0, 12, 0.25, 1e+21, -0.0, 'text', [1.5, {'c': -3}], False],
+        })
+        expected = json.loads(document)['keep']
+        rand = random.Random(0)
+        for _ in range(200):
+            cuts = sorted(rand.sample(range(1, len(document)), rand.randint(1, 20)))
+            chunks = [document[start:end] for start, end in zip([0] + cuts, cuts + [len(document)])]
+            self.assertEqual(list(iter_json(chunks, ['keep', WILDCARD])), expected)
+
+    def test_object_values(self):
+        self.assertEqual(
+            list(iter_json(['{"a.py": [1, 2], "b.py": [], "c.py": [3]}'], [WILDCARD, WILDCARD])),
+            [1, 2, 3]
+        )
+
+    def test_empty(self):
+        self.assertEqual(list(iter_json([''], [WILDCARD])), [])
+        self.assertEqual(list(iter_json(['  []\n'], [WILDCARD])), [])
+        self.assertEqual(list(iter_json(['{}'], ['runs', WILDCARD])), [])
+
+    def test_unexpected_shape(self):
+        # Values that are not containers where the path expects one are skipped
+        self.assertEqual(list(iter_json(['{"runs": null, "other": []}'], ['runs', WILDCARD])), [])
+        self.assertEqual(list(iter_json(['[[1], 2, [3]]'], [WILDCARD, WILDCARD])), [1, 3])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_json(['[1, 2'], [WILDCARD]))
+        with self.assertRaises(ValueError):
+            list(iter_json(['[1 2]'], [WILDCARD]))
+
+    def test_skipped_values(self):
+        document = '{"skip": ["a \\"]\\\\", {"b": [[]]}, 1e3], "s": "}]", "n": null, "keep": [1, 2]}'
+        for size in (1, 2, 3, len(document)):
+            chunks = [document[start:start + size] for start in range(0, len(document), size)]
+            self.assertEqual(list(iter_json(chunks, ['keep', WILDCARD])), [1, 2])
+        with self.assertRaises(ValueError):
+            list(iter_json(['{"skip": [1, "]', '"'], ['keep']))
+
+    def test_large_values_read_a_line_at_a_time(self):
+        # Like a pretty printed SARIF log, with a long list of rules
+        # before the results
+        document = json.dumps({
+            'rules': [{'id': str(rule), 'text': 'x' * 50} for rule in range(2000)],
+            'results': [{'lines': list(range(2000))}],
+        }, indent=2)
+        decoder = mock.Mock(wraps=json_stream._DECODER)
+        with mock.patch.object(json_stream, '_DECODER', decoder):
+            results = list(iter_json(document.splitlines(True), ['results', WILDCARD]))
+
+        self.assertEqual(results, [{'lines': list(range(2000))}])
+        # Skipped values are not decoded, and values that are are not decoded
+        # again for each line they continue on
+        self.assertLess(decoder.raw_decode.call_count, 50)
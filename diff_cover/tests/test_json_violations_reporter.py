@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+import os
+import unittest
+
+from mock import patch
+
+from diff_cover.violationsreporters.base import QualityReporter, Violation
+from diff_cover.violationsreporters.json_violations_reporter import (
+    EslintJsonDriver, Flake8JsonDriver, PylintJsonDriver)
+
+
+def _setup_patch(return_value, status_code=0):
+    popen = patch('diff_cover.command_runner.subprocess.Popen').start()
+    popen.return_value.returncode = status_code
+    popen.return_value.communicate.return_value = return_value
+    return popen
+
+
+class PylintJsonDriverTest(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_parse_reports(self):
+        report = json.dumps([
+            {
+                "type": "convention", "module": "file", "obj": "", "line": 1, "column": 0,
+                "path": "path/to/file.py", "symbol": "missing-docstring",
+                "message": "Missing module docstring", "message-id": "C0111"
+            },
+            {
+                "type": "warning", "module": "file", "obj": "func_2", "line": 11, "column": 4,
+                "path": "path/to/file.py", "symbol": "unused-variable",
+                "message": "Unused variable 'unused: ☃'", "message-id": "W0612"
+            },
+            {
+                "type": "refactor", "module": "file", "obj": "", "line": 1, "column": 0,
+                "path": "path/to/file.py", "symbol": "duplicate-code",
+                "message": "Similar lines in 2 files\n==file:5\n==other:10\n  return 1",
+                "message-id": "R0801"
+            },
+        ], indent=4)
+
+        violations = PylintJsonDriver().parse_reports([report])
+        self.assertEqual(dict(violations), {
+            'path/to/file.py': [
+                Violation(1, 'C0111: (missing-docstring), : Missing module docstring'),
+                Violation(11, "W0612: (unused-variable), func_2: Unused variable 'unused: ☃'"),
+            ],
+            'file.py': [Violation(5, 'R0801: (duplicate-code), : Similar lines in 2 files')],
+            'other.py': [Violation(10, 'R0801: (duplicate-code), : Similar lines in 2 files')],
+        })
+
+    def test_runs_tool(self):
+        patch('diff_cover.violationsreporters.base.os.path.exists', return_value=True).start()
+        popen = _setup_patch((b'[]\n', b''), status_code=16)
+        patch.object(PylintJsonDriver, 'installed', return_value=True).start()
+
+        quality = QualityReporter(PylintJsonDriver())
+        self.assertEqual(quality.violations('file.py'), [])
+        self.assertEqual(popen.call_args[0][0], ['pylint', '--output-format=json', b'file.py'])
+
+
+class EslintJsonDriverTest(unittest.TestCase):
+
+    def test_parse_reports(self):
+        report = json.dumps([
+            {
+                "filePath": os.path.abspath("path/to/file.js"),
+                "messages": [
+                    {"ruleId": "semi", "severity": 2, "message": "Missing semicolon.", "line": 3, "column": 10},
+                    {"ruleId": "no-unused-vars", "severity": 1, "message": "'x' is unused.", "line": 7,
+                     "column": 5},
+                    {"ruleId": None, "fatal": True, "severity": 2, "message": "Parsing error: Unexpected token",
+                     "line": 9, "column": 1},
+                ],
+            },
+            {"filePath": os.path.abspath("clean.js"), "messages": []},
+        ])
+
+        violations = EslintJsonDriver().parse_reports([report])
+        self.assertEqual(dict(violations), {
+            'path/to/file.js': [
+                Violation(3, 'Error - Missing semicolon. (semi)'),
+                Violation(7, "Warning - 'x' is unused. (no-unused-vars)"),
+                Violation(9, 'Error - Parsing error: Unexpected token'),
+            ]
+        })
+
+
+class Flake8JsonDriverTest(unittest.TestCase):
+
+    def tearDown(self):
+        patch.stopall()
+
+    def test_parse_reports(self):
+        report = json.dumps({
+            "path/to/file.py": [
+                {"code": "E225", "filename": "path/to/file.py", "line_number": 2, "column_number": 6,
+                 "text": "missing whitespace around operator", "physical_line": "x=1\n"},
+                {"code": "F401", "filename": "path/to/file.py", "line_number": 1, "column_number": 1,
+                 "text": "'os' imported but unused", "physical_line": "import os\n"},
+            ],
+            "clean.py": [],
+        })
+
+        violations = Flake8JsonDriver().parse_reports([report])
+        self.assertEqual(dict(violations), {
+            'path/to/file.py': [
+                Violation(2, 'E225 missing whitespace around operator'),
+                Violation(1, "F401 'os' imported but unused"),
+            ]
+        })
+
+    def test_installed_requires_plugin(self):
+        _setup_patch((b'3.9.2 (mccabe: 0.6.1, pycodestyle: 2.7.0, pyflakes: 2.3.1) CPython 3.8.5 on Linux', b''))
+        self.assertFalse(Flake8JsonDriver().installed())
+
+        _setup_patch((b'3.9.2 (flake8-json: 21.1.0, mccabe: 0.6.1, pycodestyle: 2.7.0) CPython 3.8.5', b''))
+        self.assertTrue(Flake8JsonDriver().installed())
+
+    def test_installed_without_flake8(self):
+        patch('diff_cover.command_runner.subprocess.Popen', side_effect=OSError).start()
+        self.assertFalse(Flake8JsonDriver().installed())
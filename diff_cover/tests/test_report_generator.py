@@ -172,6 +172,12 @@ class SimpleReportGeneratorTest(BaseReportGeneratorTest):
     def test_src_paths(self):
         self.assertEqual(self.report.src_paths(), self.SRC_PATHS)
 
+    def test_changed_lines_passed_to_reporter(self):
+        self.report.src_paths()
+        self.coverage.set_changed_lines.assert_called_once_with(
+            {src_path: self.LINES for src_path in self.SRC_PATHS}
+        )
+
     def test_coverage_name(self):
         self.assertEqual(self.report.coverage_report_name(),
                          self.XML_REPORT_NAME)
@@ -200,6 +206,13 @@ class SimpleReportGeneratorTest(BaseReportGeneratorTest):
         for src_path in self.SRC_PATHS:
             self.assertEqual(self.report.violation_lines(src_path), expected)
 
+    def test_violation_range(self):
+
+        # A violation on a range of lines is on each
+        # changed line in the range
+        self.set_violations('file1.py', [Violation(4, None, 12), Violation(16, None, 100)])
+        self.assertEqual(self.report.violation_lines('file1.py'), [4, 5, 10, 11, 12])
+
     def test_src_with_no_info(self):
 
         self.assertNotIn('unknown.py', self.report.src_paths())
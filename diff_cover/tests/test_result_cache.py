@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from diff_cover.result_cache import ResultCache, file_digest
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(lambda: shutil.rmtree(self.temp_dir))
+        self.cache = ResultCache(os.path.join(self.temp_dir, 'cache'))
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', [(1, 'E225 鄴'), (7, 'W291')])
+        self.assertEqual(self.cache.get('key'), [[1, 'E225 鄴'], [7, 'W291']])
+
+    def test_tool_key(self):
+        key = ResultCache.tool_key('pylint', '2.0', None)
+        self.assertEqual(key, ResultCache.tool_key('pylint', '2.0', None))
+        self.assertNotEqual(key, ResultCache.tool_key('pylint', '2.1', None))
+        self.assertNotEqual(key, ResultCache.tool_key('pylint', '2.0', '--disable=C'))
+        self.assertNotEqual(
+            ResultCache.tool_key('ab', 'c'), ResultCache.tool_key('a', 'bc')
+        )
+
+    def test_file_digest(self):
+        path = os.path.join(self.temp_dir, 'file.py')
+        with open(path, 'wb') as source:
+            source.write(b'x = 1\n')
+        digest = file_digest(path)
+
+        with open(path, 'wb') as source:
+            source.write(b'x = 2\n')
+        self.assertNotEqual(file_digest(path), digest)
+        self.assertIsNone(file_digest(os.path.join(self.temp_dir, 'missing.py')))
+
+    def test_prune_least_recently_used(self):
+        for index, key in enumerate(['old', 'used', 'new']):
+            self.cache.set(key, [(1, 'x' * 100)])
+            path = os.path.join(self.cache.directory, key + '.json')
+            os.utime(path, (1000 + index, 1000 + index))
+
+        # Reading an entry makes it the most recently used
+        self.cache.get('used')
+
+        self.cache.max_size = 2 * os.path.getsize(path)
+        self.cache.prune()
+
+        self.assertIsNone(self.cache.get('old'))
+        self.assertIsNotNone(self.cache.get('used'))
+        self.assertIsNotNone(self.cache.get('new'))
+
+    def test_unwritable_directory(self):
+        blocker = os.path.join(self.temp_dir, 'file')
+        open(blocker, 'w').close()
+
+        cache = ResultCache(os.path.join(blocker, 'cache'))
+        cache.set('key', [(1, 'message')])
+        self.assertIsNone(cache.get('key'))
+        cache.prune()
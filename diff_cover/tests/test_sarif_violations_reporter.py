@@ -0,0 +1,116 @@
+from __future__ import unicode_literals
+
+import json
+import os
+import unittest
+
+from six import BytesIO
+
+from diff_cover.violationsreporters.base import QualityReporter, Violation
+from diff_cover.violationsreporters.sarif_violations_reporter import SarifDriver
+
+
+def _location(uri, start_line=None, end_line=None):
+    region = {}
+    if start_line is not None:
+        region['startLine'] = start_line
+    if end_line is not None:
+        region['endLine'] = end_line
+    return {'physicalLocation': {'artifactLocation': {'uri': uri}, 'region': region}}
+
+
+SARIF_LOG = {
+    'version': '2.1.0',
+    'runs': [
+        {
+            'tool': {'driver': {'name': 'semgrep', 'rules': [{'id': 'no-eval'}]}},
+            'results': [
+                {
+                    'ruleId': 'no-eval',
+                    'message': {'text': 'Avoid eval'},
+                    'locations': [_location('src/app.py', 3)],
+                },
+                {
+                    'ruleId': 'long-function',
+                    'message': {'text': 'Function is too long'},
+                    'locations': [_location('src/app.py', 10, 12), _location('src/other.py', 1)],
+                },
+                {
+                    'ruleId': 'no-location',
+                    'message': {'text': 'Applies to the whole project'},
+                },
+                {
+                    'ruleId': 'index-only',
+                    'message': {'text': 'Refers to artifacts by index'},
+                    'locations': [{'physicalLocation': {'artifactLocation': {'index': 0},
+                                                        'region': {'startLine': 1}}}],
+                },
+            ],
+            'artifacts': [{'location': {'uri': 'src/app.py'}}],
+        },
+        {
+            'tool': {'driver': {'name': 'CodeQL'}},
+            'results': [
+                {
+                    'ruleId': 'js/xss',
+                    'message': {'text': 'Cross-site scripting'},
+                    'locations': [_location('web/My%20Page.js', 7)],
+                },
+                {
+                    'message': {'text': 'No rule'},
+                    'locations': [_location('file://' + os.path.abspath('web/page.js'), 2)],
+                },
+            ],
+        },
+    ],
+}
+
+
+class SarifDriverTest(unittest.TestCase):
+
+    def test_parse_reports(self):
+        violations = SarifDriver().parse_reports([json.dumps(SARIF_LOG, indent=2)])
+
+        self.assertEqual(dict(violations), {
+            os.path.join('src', 'app.py'): [
+                Violation(3, 'no-eval: Avoid eval'),
+                Violation(10, 'long-function: Function is too long', 12),
+            ],
+            os.path.join('src', 'other.py'): [Violation(1, 'long-function: Function is too long')],
+            os.path.join('web', 'My Page.js'): [Violation(7, 'js/xss: Cross-site scripting')],
+            os.path.join('web', 'page.js'): [Violation(2, 'No rule')],
+        })
+
+    def test_only_changed_files(self):
+        changed_lines = {
+            os.path.join('src', 'app.py'): {3, 4, 11},
+            os.path.join('web', 'page.js'): {1},
+        }
+        violations = SarifDriver().parse_reports([json.dumps(SARIF_LOG)], changed_lines)
+
+        self.assertEqual(dict(violations), {
+            os.path.join('src', 'app.py'): [
+                Violation(3, 'no-eval: Avoid eval'),
+                Violation(10, 'long-function: Function is too long', 12),
+            ],
+            os.path.join('web', 'page.js'): [Violation(2, 'No rule')],
+        })
+
+    def test_empty_log(self):
+        self.assertEqual(dict(SarifDriver().parse_reports(['{"version": "2.1.0", "runs": []}'])), {})
+
+    def test_quality_reporter(self):
+        quality = QualityReporter(SarifDriver(), reports=[BytesIO(json.dumps(SARIF_LOG).encode('utf-8'))])
+        quality.set_changed_lines({'src/app.py': [3, 11, 12], 'README.md': [1]})
+
+        # SARIF results can be about any kind of file
+        self.assertIsNone(quality.measured_lines('README.md'))
+        self.assertEqual(quality.violations('README.md'), [])
+        self.assertEqual(quality.violations('src/app.py'), [
+            Violation(3, 'no-eval: Avoid eval'),
+            Violation(10, 'long-function: Function is too long', 12),
+        ])
+        self.assertEqual(quality.violations('src/other.py'), [])
+
+    def test_not_installed(self):
+        self.assertFalse(SarifDriver().installed())
@@ -2,8 +2,10 @@
 from __future__ import unicode_literals
 
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import xml.etree.cElementTree as etree
 from subprocess import Popen
 from textwrap import dedent
@@ -12,14 +14,15 @@ import mock
 
 import six
 from diff_cover.violationsreporters import base
+from diff_cover.result_cache import ResultCache
 
-from diff_cover.command_runner import CommandError, run_command_for_code
+from diff_cover.command_runner import CommandError, STDERR_LIMIT, execute_spooled, run_command_for_code
 import unittest
 from diff_cover.violationsreporters.base import QualityReporter
 from diff_cover.violationsreporters.violations_reporter import (
-    XmlCoverageReporter, Violation, pycodestyle_driver, pyflakes_driver,
-    flake8_driver, PylintDriver, jshint_driver, eslint_driver,
-    pydocstyle_driver)
+    XmlCoverageReporter, LcovCoverageReporter, Violation, pycodestyle_driver, pyflakes_driver,
+    flake8_driver, ModulePaths, PylintDriver, jshint_driver, eslint_driver,
+    pydocstyle_driver, _bitmap_and, _bitmap_or, _bitmap_lines, _line_bitmap)
 from mock import Mock, patch, MagicMock
 from six import BytesIO, StringIO
 
@@ -345,6 +348,15 @@ class XmlCoverageReporterTest(unittest.TestCase):
 
         return root
 
+    def test_changed_lines(self):
+        xml = self._coverage_xml(['file1.py'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = XmlCoverageReporter([xml])
+        coverage.set_changed_lines({'file1.py': [2, 3, 4, 11]})
+
+        # Only line entries inside the changed lines are materialized
+        self.assertEqual({Violation(3, None), Violation(11, None)}, coverage.violations('file1.py'))
+        self.assertEqual({2, 3, 11}, coverage.measured_lines('file1.py'))
+
     def test_to_unix_path(self):
         """
         Ensure the _to_unix_path static function handles paths properly.
@@ -404,6 +416,14 @@ class CloverXmlCoverageReporterTest(unittest.TestCase):
         result = coverage.violations('file1.java')
         self.assertEqual(result, violations)
 
+    def test_files_not_in_diff(self):
+        xml = self._coverage_xml(['file1.java', 'file2.java'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = XmlCoverageReporter([xml])
+        coverage.set_changed_lines({'file1.java': [3, 5]})
+
+        self.assertEqual({Violation(3, None)}, coverage.violations('file1.java'))
+        self.assertEqual(set(), coverage.violations('file2.java'))
+
     def test_two_inputs_first_violate(self):
 
         # Construct the XML report
@@ -643,6 +663,14 @@ class JacocoXmlCoverageReporterTest(unittest.TestCase):
         result = coverage.violations('file1.java')
         self.assertEqual(result, violations)
 
+    def test_src_roots(self):
+        xml = self._coverage_xml(['pkg/File.java'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = XmlCoverageReporter([xml], ['src/main/java', 'src/test/java'])
+
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('src/main/java/pkg/File.java'))
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('src/test/java/pkg/File.java'))
+        self.assertEqual(set(), coverage.violations('pkg/File.java'))
+
     def test_two_inputs_first_violate(self):
 
         # Construct the XML report
@@ -836,6 +864,106 @@ class JacocoXmlCoverageReporterTest(unittest.TestCase):
         return root
 
 
+class LcovCoverageReporterTest(unittest.TestCase):
+
+    MANY_VIOLATIONS = {Violation(3, None), Violation(7, None),
+                       Violation(11, None), Violation(13, None)}
+    FEW_MEASURED = {2, 3, 5, 7, 11, 13}
+
+    FEW_VIOLATIONS = {Violation(3, None), Violation(11, None)}
+    MANY_MEASURED = {2, 3, 5, 7, 11, 13, 17}
+
+    def setUp(self):
+        # Paths generated by git_path are always the given argument
+        _git_path_mock = patch('diff_cover.violationsreporters.violations_reporter.GitPathTool').start()
+        _git_path_mock.relative_path = lambda path: path
+        _git_path_mock.absolute_path = lambda path: os.path.abspath(path)
+        self.addCleanup(patch.stopall)
+
+    def test_violations(self):
+        lcov = self._tracefile(['file1.py', 'subdir/file2.py'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = LcovCoverageReporter([lcov])
+
+        self.assertEqual(coverage.name(), "LCOV")
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('file1.py'))
+        self.assertEqual(self.FEW_MEASURED, coverage.measured_lines('file1.py'))
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('subdir/file2.py'))
+
+    def test_absolute_source_paths(self):
+        lcov = self._tracefile([os.path.abspath('file1.py')], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = LcovCoverageReporter([lcov])
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('file1.py'))
+
+    def test_two_inputs(self):
+        lcov1 = self._tracefile(['file1.py'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        lcov2 = self._tracefile(['file1.py'], self.FEW_VIOLATIONS, self.MANY_MEASURED)
+        coverage = LcovCoverageReporter([lcov1, lcov2])
+
+        self.assertEqual(
+            self.MANY_VIOLATIONS & self.FEW_VIOLATIONS,
+            coverage.violations('file1.py')
+        )
+        self.assertEqual(
+            self.FEW_MEASURED | self.MANY_MEASURED,
+            coverage.measured_lines('file1.py')
+        )
+
+    def test_different_files_in_inputs(self):
+        coverage = LcovCoverageReporter([
+            self._tracefile(['file.py'], self.MANY_VIOLATIONS, self.FEW_MEASURED),
+            self._tracefile(['other_file.py'], self.FEW_VIOLATIONS, self.MANY_MEASURED)
+        ])
+
+        self.assertEqual(self.MANY_VIOLATIONS, coverage.violations('file.py'))
+        self.assertEqual(self.FEW_VIOLATIONS, coverage.violations('other_file.py'))
+
+    def test_skips_files_not_in_diff(self):
+        lcov = BytesIO(dedent("""
+            TN:
+            SF:file1.py
+            DA:1,0
+            end_of_record
+            SF:file2.py
+            DA:not a line number
+            end_of_record
+        """).strip().encode('utf-8'))
+        coverage = LcovCoverageReporter([lcov])
+        coverage.set_changed_lines({'file1.py': [1]})
+
+        # The malformed record is never parsed
+        self.assertEqual({Violation(1, None)}, coverage.violations('file1.py'))
+        self.assertEqual(set(), coverage.violations('file2.py'))
+
+    def test_skips_lines_not_in_diff(self):
+        lcov = self._tracefile(['file1.py'], self.MANY_VIOLATIONS, self.FEW_MEASURED)
+        coverage = LcovCoverageReporter([lcov])
+        coverage.set_changed_lines({'file1.py': [2, 3, 4, 11]})
+
+        self.assertEqual({Violation(3, None), Violation(11, None)}, coverage.violations('file1.py'))
+        self.assertEqual({2, 3, 11}, coverage.measured_lines('file1.py'))
+
+    def test_no_such_file(self):
+        coverage = LcovCoverageReporter([self._tracefile([], [], [])])
+        self.assertEqual(set(), coverage.violations('file.py'))
+        self.assertEqual(set(), coverage.measured_lines('file.py'))
+
+    @staticmethod
+    def _tracefile(file_paths, violations, measured):
+        """
+        Build an LCOV tracefile where every source file in `file_paths`
+        has the same set of covered and uncovered lines.
+        """
+        violation_lines = {violation.line for violation in violations}
+        lines = ['TN:']
+        for path in file_paths:
+            lines.append('SF:{}'.format(path))
+            for line_num in sorted(measured):
+                hits = 0 if line_num in violation_lines else 1
+                lines.append('DA:{},{}'.format(line_num, hits))
+            lines.append('end_of_record')
+        return BytesIO('\n'.join(lines).encode('utf-8'))
+
+
 class pycodestyleQualityReporterTest(unittest.TestCase):
 
     def setUp(self):
@@ -877,6 +1005,153 @@ class pycodestyleQualityReporterTest(unittest.TestCase):
 
         self.assertEqual(expected_violations, quality.violations('../new_file.py'))
 
+    def test_batches_changed_files(self):
+        return_string = dedent("""
+                file1.py:1:17: E231 whitespace
+                file3.py:7:1: E302 blank lines
+            """).strip() + '\n'
+        process = _setup_patch((return_string.encode('utf-8'), b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+        patch.object(pycodestyle_driver, 'diff_options', None).start()
+
+        quality = QualityReporter(pycodestyle_driver)
+        quality.set_changed_lines({'file1.py': [1], 'file2.py': [2], 'file3.py': [7], 'file.js': [1]})
+
+        self.assertEqual([Violation(1, 'E231 whitespace')], quality.violations('file1.py'))
+        self.assertEqual([], quality.violations('file2.py'))
+        self.assertEqual([Violation(7, 'E302 blank lines')], quality.violations('file3.py'))
+
+        # The tool only ran once, on every changed python file
+        self.assertEqual(popen.call_count, 1)
+        self.assertEqual(
+            popen.call_args[0][0],
+            ['pycodestyle', b'file1.py', b'file2.py', b'file3.py']
+        )
+
+    def test_changed_lines_only(self):
+        process = _setup_patch((b'./file1.py:1:17: E231 whitespace\n', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+
+        quality = QualityReporter(pycodestyle_driver)
+        quality.set_changed_lines({'file1.py': [1, 2, 5], 'file2.py': [2], 'file3.py': []})
+        self.assertEqual([Violation(1, 'E231 whitespace')], quality.violations('file1.py'))
+
+        # The changed lines are given to the tool as a diff, instead of the files
+        self.assertEqual(popen.call_count, 1)
+        self.assertEqual(popen.call_args[0][0], ['pycodestyle', '--diff'])
+        process.communicate.assert_called_once_with(
+            base.unified_diff({'file1.py': [(1, 2), (5, 5)], 'file2.py': [(2, 2)], 'file3.py': []}).encode('ascii')
+        )
+
+    def test_parallel_jobs(self):
+        process = _setup_patch((b'', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+
+        patch.object(pycodestyle_driver, 'diff_options', None).start()
+
+        quality = QualityReporter(pycodestyle_driver, jobs=2)
+        quality.set_changed_lines({'file1.py': [1], 'file2.py': [2], 'file3.py': [7]})
+        quality.violations('file1.py')
+
+        self.assertEqual(
+            sorted(call[0][0] for call in popen.call_args_list),
+            [['pycodestyle', b'file1.py', b'file2.py'], ['pycodestyle', b'file3.py']]
+        )
+
+    def test_cached_results(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir)
+        for name in ('file1.py', 'file2.py'):
+            with open(name, 'w') as source:
+                source.write('x=1\n')
+
+        return_string = 'file1.py:1:2: E225 missing whitespace\n'
+        process = _setup_patch((return_string.encode('utf-8'), b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        probe = patch.object(pycodestyle_driver, 'probe', return_value=(True, '2.4.0')).start()
+        executable = os.path.join(temp_dir, 'pycodestyle')
+        open(executable, 'w').close()
+        os.utime(executable, (1000000000, 1000000000))
+        patch.object(base, 'which', return_value=executable).start()
+
+        def lint(changed_lines):
+            quality = QualityReporter(pycodestyle_driver, cache=ResultCache('cache'))
+            quality.set_changed_lines(changed_lines)
+            return quality.violations('file1.py'), quality.violations('file2.py')
+
+        expected = ([Violation(1, 'E225 missing whitespace')], [])
+        self.assertEqual(lint({'file1.py': [1], 'file2.py': [1]}), expected)
+        self.assertEqual(popen.call_count, 1)
+
+        # Nothing changed, so the tool does not need to run again
+        self.assertEqual(lint({'file1.py': [1], 'file2.py': [1]}), expected)
+        self.assertEqual(popen.call_count, 1)
+
+        # Only the modified file is checked again
+        with open('file2.py', 'w') as source:
+            source.write('y=2\n')
+        process.communicate.return_value = (b'file2.py:1:2: E225 missing whitespace\n', b'')
+        self.assertEqual(
+            lint({'file1.py': [1], 'file2.py': [1]}),
+            ([Violation(1, 'E225 missing whitespace')], [Violation(1, 'E225 missing whitespace')])
+        )
+        self.assertEqual(popen.call_count, 2)
+        self.assertEqual(popen.call_args[0][0], ['pycodestyle', b'file2.py'])
+
+        # The tool's version was only asked for once
+        self.assertEqual(probe.call_count, 1)
+
+        # Upgrading the tool discards everything
+        probe.return_value = (True, '2.5.0')
+        os.utime(executable, (1000000001, 1000000001))
+        lint({'file1.py': [1], 'file2.py': [1]})
+        self.assertEqual(probe.call_count, 2)
+        self.assertEqual(popen.call_args[0][0], ['pycodestyle', b'file1.py', b'file2.py'])
+
+    def test_cached_results_whole_files(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir)
+        with open('file1.py', 'w') as source:
+            source.write('x=1\ny=2\n')
+
+        process = _setup_patch((b'file1.py:1:2: E225 missing whitespace\n', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        patch.object(pycodestyle_driver, 'probe', return_value=(True, '2.4.0')).start()
+
+        def lint(lines):
+            quality = QualityReporter(pycodestyle_driver, cache=ResultCache('cache'))
+            quality.set_changed_lines({'file1.py': lines})
+            return quality.violations('file1.py')
+
+        self.assertEqual(lint([2]), [])
+
+        # The cached results are not limited to the lines changed the first time
+        self.assertEqual(lint([1]), [Violation(1, 'E225 missing whitespace')])
+        self.assertEqual(popen.call_count, 1)
+
+    def test_batches_respect_command_length_limit(self):
+        process = _setup_patch((b'', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+        patch.object(base, '_max_command_length', return_value=len('pycodestyle file1.py file2.py ')).start()
+        patch.object(pycodestyle_driver, 'diff_options', None).start()
+
+        quality = QualityReporter(pycodestyle_driver)
+        quality.set_changed_lines({'file1.py': [1], 'file2.py': [2], 'file3.py': [7]})
+        quality.violations('file1.py')
+
+        self.assertEqual(
+            [call[0][0] for call in popen.call_args_list],
+            [['pycodestyle', b'file1.py', b'file2.py'], ['pycodestyle', b'file3.py']]
+        )
+
     def test_no_quality_issues_newline(self):
 
         # Patch the output of `pycodestyle`
@@ -964,6 +1239,54 @@ class pycodestyleQualityReporterTest(unittest.TestCase):
         for expected in expected_violations:
             self.assertIn(expected, actual_violations)
 
+    def test_pregenerated_report_streamed(self):
+        # Reports are read in pieces, rather than all at once,
+        # and violations outside the diff are dropped
+        lines = ['path/to/file.py:{}:1: E231 whitespace\n'.format(index) for index in range(1, 1001)]
+        lines.append('other/file.py:1:1: E302 blank lines\n')
+        report = BytesIO(''.join(lines).encode('utf-8'))
+        read_sizes = []
+        report_read = report.read
+
+        def read(*args):
+            read_sizes.append(args)
+            return report_read(*args)
+        report.read = read
+
+        quality = QualityReporter(pycodestyle_driver, reports=[report])
+        quality.set_changed_lines({'path/to/file.py': [1, 2]})
+
+        self.assertEqual(len(quality.violations('path/to/file.py')), 2)
+        self.assertEqual(list(quality.violations_dict), ['path/to/file.py'])
+        # Violations on lines the diff did not change are not even kept
+        self.assertEqual(len(quality.violations_dict['path/to/file.py']), 2)
+        self.assertTrue(read_sizes)
+        self.assertNotIn((), read_sizes)
+
+    def test_pregenerated_report_parsed_once(self):
+
+        # Looking up many files (including clean ones) should only
+        # read the report the first time
+        report = BytesIO(dedent("""
+            path/to/file.py:1:17: E231 whitespace
+            another/file.py:7:1: E302 blank lines
+        """).strip().encode('utf-8'))
+
+        quality = QualityReporter(pycodestyle_driver, reports=[report])
+
+        with patch.object(pycodestyle_driver, 'parse_reports',
+                          wraps=pycodestyle_driver.parse_reports) as parse_reports:
+            self.assertEqual(
+                quality.violations('./path/to/file.py'),
+                [Violation(1, 'E231 whitespace')]
+            )
+            self.assertEqual(
+                quality.violations('another/file.py'),
+                [Violation(7, 'E302 blank lines')]
+            )
+            self.assertEqual(quality.violations('clean/file.py'), [])
+            self.assertEqual(parse_reports.call_count, 1)
+
 
 class PyflakesQualityReporterTest(unittest.TestCase):
     """
@@ -1306,6 +1629,39 @@ class PydocstlyeQualityReporterTest(unittest.TestCase):
         for expected in expected_violations:
             self.assertIn(expected, actual_violations)
 
+    def test_parse_two_line_records(self):
+        report = dedent("""
+            new_file.py:1 at module level:
+                    D100: Missing docstring in public module
+            Some stray output without a message line
+            new_file.py:13 in public function `gather`:
+            new_file.py:20 in public class `Thing`:
+                    D101: Missing docstring in public class
+                    D999: Not preceded by a header
+        """).strip()
+
+        self.assertEqual(dict(pydocstyle_driver.parse_reports([report])), {
+            'new_file.py': [
+                Violation(1, 'D100: Missing docstring in public module'),
+                Violation(20, 'D101: Missing docstring in public class'),
+            ]
+        })
+
+    def test_parse_large_report(self):
+        # Parsing is linear in the size of the report
+        report = '\n'.join(
+            'file{0}.py:{0} in public function `func`:\n'
+            '        D103: Missing docstring in public function'.format(index)
+            for index in range(20000)
+        )
+        violations = pydocstyle_driver.parse_reports([report])
+        self.assertEqual(len(violations), 20000)
+        self.assertEqual(
+            violations['file19999.py'],
+            [Violation(19999, 'D103: Missing docstring in public function')]
+        )
+
+
 class PylintQualityReporterTest(unittest.TestCase):
 
     def setUp(self):
@@ -1332,6 +1688,60 @@ class PylintQualityReporterTest(unittest.TestCase):
             result = quality.violations(path)
             self.assertEqual(result, [])
 
+    def test_supported_extensions(self):
+        quality = QualityReporter(PylintDriver())
+        self.assertTrue(quality._is_supported('path/to/file.py'))
+        self.assertTrue(quality._is_supported('FILE.PY'))
+        # Only the extension counts, not the end of the name
+        self.assertFalse(quality._is_supported('scripts/numpy'))
+        self.assertFalse(quality._is_supported('file.pyc'))
+        self.assertIsNone(quality.measured_lines('FILE.PY'))
+        self.assertEqual(quality.measured_lines('scripts/numpy'), [])
+
+    def test_cached_results_checked_together(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir)
+        with open('file1.py', 'w') as source:
+            source.write('x = 1\n')
+
+        process = _setup_patch((b'', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        driver = PylintDriver()
+        patch.object(driver, 'probe', return_value=(True, '2.4.0')).start()
+
+        def lint(changed_lines):
+            quality = QualityReporter(driver, cache=ResultCache('cache'))
+            quality.set_changed_lines(changed_lines)
+            return [quality.violations(src_path) for src_path in sorted(changed_lines)]
+
+        self.assertEqual(lint({'file1.py': [1]}), [[]])
+        self.assertEqual(lint({'file1.py': [1]}), [[]])
+        self.assertEqual(popen.call_count, 1)
+
+        # A new copy of the file is a violation in both of them,
+        # so the unchanged file is checked again with the new one
+        with open('file2.py', 'w') as source:
+            source.write('x = 1\n')
+        process.communicate.return_value = (dedent("""
+            file2.py:1: [R0801] Similar lines in 2 files
+            ==file1:1
+            ==file2:1
+            x = 1
+        """).strip().encode('ascii'), b'')
+        expected = [[Violation(1, 'R0801: Similar lines in 2 files')]] * 2
+        self.assertEqual(lint({'file1.py': [1], 'file2.py': [1]}), expected)
+        self.assertEqual(popen.call_count, 2)
+        self.assertEqual(popen.call_args[0][0][-2:], [b'file1.py', b'file2.py'])
+        self.assertEqual(lint({'file1.py': [1], 'file2.py': [1]}), expected)
+        self.assertEqual(popen.call_count, 2)
+
+        # Without the copy, the results from when the file was
+        # checked on its own apply again
+        self.assertEqual(lint({'file1.py': [1]}), [[]])
+        self.assertEqual(popen.call_count, 2)
+
     def test_quality(self):
         # Patch the output of `pylint`
         _setup_patch((
@@ -1385,6 +1795,77 @@ class PylintQualityReporterTest(unittest.TestCase):
         for expected in expected_violations:
             self.assertIn(expected, actual_violations)
 
+    def test_jobs_check_files_together(self):
+        process = _setup_patch((b'', b''))
+        popen = mock.patch('diff_cover.command_runner.subprocess.Popen', return_value=process).start()
+        _patch_so_all_files_exist()
+        patch.object(PylintDriver, 'installed', return_value=True).start()
+
+        quality = QualityReporter(PylintDriver(), jobs=4)
+        quality.set_changed_lines({'file1.py': [1], 'file2.py': [2], 'file3.py': [7]})
+        quality.violations('file1.py')
+
+        # Duplicate code is only found between files checked by the same run
+        self.assertEqual(popen.call_count, 1)
+        self.assertEqual(popen.call_args[0][0][-3:], [b'file1.py', b'file2.py', b'file3.py'])
+
+    def test_parse_changed_lines_only(self):
+        report = dedent("""
+            file1.py:1: [C0111] Missing docstring
+            file1.py:2: [C0111] Missing docstring
+            file1.py:162: [R0801] Similar lines in 2 files
+            ==file1:162
+            ==student.views:4
+            import json
+            other.py:1: [C0111] Missing docstring
+        """).strip()
+        changed_lines = {'file1.py': {1}, os.path.join('lms', 'student', 'views.py'): {4}}
+
+        # Duplicate code is found in the files that follow the
+        # message, even though the message is about another line
+        self.assertEqual(dict(PylintDriver().parse_reports([report], changed_lines)), {
+            'file1.py': [Violation(1, 'C0111: Missing docstring')],
+            os.path.join('lms', 'student', 'views.py'): [Violation(4, 'R0801: Similar lines in 2 files')],
+        })
+
+    def test_parse_dupe_code_blocks(self):
+        # Newer versions of pylint give the range of lines that are the same
+        report = dedent("""
+            a.py:1: [R0801(duplicate-code), ] Similar lines in 2 files
+            ==pkg.a:[1:10]
+            ==pkg.b:[4:13]
+                import os
+            b.py:1: [R0801(duplicate-code), ] Similar lines in 3 files
+            ==pkg:[1:3]
+            ==pkg.a:[20:22]
+            b.py:5: [C0111] Missing docstring
+        """).strip()
+        a_path = os.path.join('src', 'pkg', 'a.py')
+        init_path = os.path.join('src', 'pkg', '__init__.py')
+
+        changed_lines = {a_path: None, init_path: None, 'b.py': None}
+
+        error_str = 'R0801: (duplicate-code), : Similar lines in {} files'
+        self.assertEqual(dict(PylintDriver().parse_reports([report], changed_lines)), {
+            a_path: [Violation(1, error_str.format(2)), Violation(20, error_str.format(3))],
+            init_path: [Violation(1, error_str.format(3))],
+            'b.py': [Violation(5, 'C0111: Missing docstring')],
+        })
+
+    def test_module_paths(self):
+        module_paths = ModulePaths([
+            os.path.join('src', 'pkg', '__init__.py'),
+            os.path.join('src', 'pkg', 'views.py'),
+            os.path.join('other', 'views.py'),
+            'README.rst',
+        ])
+        self.assertEqual(module_paths.path('pkg'), os.path.join('src', 'pkg', '__init__.py'))
+        self.assertEqual(module_paths.path('pkg.views'), os.path.join('src', 'pkg', 'views.py'))
+        # More than one file could be the module
+        self.assertEqual(module_paths.path('views'), 'views.py')
+        self.assertEqual(module_paths.path('pkg.models'), os.path.join('pkg', 'models.py'))
+        self.assertEqual(ModulePaths().path('pkg.views'), os.path.join('pkg', 'views.py'))
+
     def test_unicode(self):
         _setup_patch(
             (dedent("""
@@ -1729,6 +2210,45 @@ class SimpleCommandTestCase(unittest.TestCase):
         self.assertEquals(good_command, 0)
 
 
+class SpooledCommandTestCase(unittest.TestCase):
+    """
+    Tests for spooling a command's output to a temporary file.
+    """
+
+    def test_stdout_in_file(self):
+        stdout, stderr = execute_spooled(
+            [sys.executable, '-c', 'import sys; sys.stdout.write(sys.stdin.read().upper())'],
+            stdin='a.py:1: E225\nb.py:2: W291\n'
+        )
+        with stdout:
+            self.assertEqual(list(stdout), ['A.PY:1: E225\n', 'B.PY:2: W291\n'])
+        self.assertEqual(stderr, '')
+
+    def test_stderr_end_kept(self):
+        script = 'import sys; sys.stderr.write("x" * 1000000 + "the end"); sys.exit(3)'
+        with self.assertRaises(CommandError) as context:
+            execute_spooled([sys.executable, '-c', script])
+        message = six.text_type(context.exception)
+        self.assertTrue(message.endswith('the end'))
+        self.assertLessEqual(len(message), STDERR_LIMIT)
+
+        stdout, stderr = execute_spooled([sys.executable, '-c', script], exit_codes=[3])
+        stdout.close()
+        self.assertTrue(stderr.endswith('the end'))
+
+    def test_quality_reporter(self):
+        _patch_so_all_files_exist()
+        patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+        self.addCleanup(patch.stopall)
+        output = StringIO('file1.py:1:17: E231 whitespace\n')
+        spooled = patch.object(base, 'execute_spooled', return_value=(output, '')).start()
+
+        quality = QualityReporter(pycodestyle_driver, spool=True)
+        self.assertEqual(quality.violations('file1.py'), [Violation(1, 'E231 whitespace')])
+        spooled.assert_called_once_with(['pycodestyle', b'file1.py'], pycodestyle_driver.exit_codes, None)
+        self.assertTrue(output.closed)
+
+
 class SubprocessErrorTestCase(unittest.TestCase):
     """
     Error in subprocess call(s)
@@ -1755,3 +2275,263 @@ class SubprocessErrorTestCase(unittest.TestCase):
                 reporter.violations("path/to/file.py")
 
             self.assertEqual(mock_stderr.getvalue(), "pycodestyle path/to/file.py")
+
+
+class ViolationStoreTest(unittest.TestCase):
+    """
+    Tests for the compact storage of violations.
+    """
+
+    def test_messages_shared(self):
+        store = base.ViolationStore()
+        for line in range(1, 4):
+            store['file.py'].append(Violation(line, ''.join(['E225 ', 'missing whitespace'])))
+        store['other.py'].append(Violation(1, 'E225 missing whitespace'))
+
+        violations = list(store['file.py']) + list(store['other.py'])
+        self.assertEqual([violation.line for violation in violations], [1, 2, 3, 1])
+        # Every violation has the same message object
+        self.assertEqual(len({id(violation.message) for violation in violations}), 1)
+
+    def test_list_compatible(self):
+        store = base.ViolationStore()
+        store['file.py'].extend([Violation(1, 'a'), Violation(2, None, 5)])
+
+        self.assertEqual(store['file.py'], [Violation(1, 'a'), Violation(2, None, 5)])
+        self.assertEqual(dict(store), {'file.py': [Violation(1, 'a'), Violation(2, None, 5)]})
+        self.assertEqual(len(store['file.py']), 2)
+        self.assertEqual(store['file.py'][-1], Violation(2, None, 5))
+        self.assertEqual(store['file.py'][:1], [Violation(1, 'a')])
+        self.assertIsNone(store.get('other.py'))
+        self.assertNotIn('other.py', store)
+
+    def test_on_lines(self):
+        store = base.ViolationStore()
+        store['file.py'].extend([
+            Violation(1, 'a'), Violation(3, 'b'), Violation(5, 'c', 10), Violation(12, 'd', 20)
+        ])
+        self.assertEqual(
+            store['file.py'].on_lines({3, 7}),
+            [Violation(3, 'b'), Violation(5, 'c', 10)]
+        )
+
+    def test_replace_from_other_store(self):
+        store, other = base.ViolationStore(), base.ViolationStore()
+        store['file.py'].append(Violation(1, 'a'))
+        other['file.py'].extend([Violation(2, 'b'), Violation(3, 'a')])
+
+        store.update(other)
+        self.assertEqual(store['file.py'], [Violation(2, 'b'), Violation(3, 'a')])
+        self.assertIs(store['file.py'].store, store)
+
+
+class ChangedLinesTest(unittest.TestCase):
+    """
+    Tests for leaving out violations the diff did not change.
+    """
+
+    def test_on_changed_line(self):
+        changed_lines = {'a.py': {1, 2}, 'b.py': None}
+        self.assertTrue(base.on_changed_line(None, 'c.py', 1))
+        self.assertTrue(base.on_changed_line(changed_lines, './a.py', 2))
+        self.assertFalse(base.on_changed_line(changed_lines, 'a.py', 3))
+        self.assertTrue(base.on_changed_line(changed_lines, 'b.py', 3))
+        self.assertFalse(base.on_changed_line(changed_lines, 'c.py', 1))
+
+    def test_report_line_filter(self):
+        self.assertIsNone(base.report_line_filter(None))
+        self.assertFalse(base.report_line_filter({})('a.py:1: E225'))
+
+        mentions = base.report_line_filter({os.path.join('path', 'a.py'): {1}, 'b.js': None})
+        self.assertTrue(mentions('./path/a.py:1:1: E225 missing whitespace'))
+        self.assertTrue(mentions('b.js: line 2, col 1, Missing semicolon'))
+        self.assertFalse(mentions('path/c.py:1:1: E225 missing whitespace'))
+
+
+class BitmapTest(unittest.TestCase):
+    """
+    Tests for combining bitmaps of covered and changed lines.
+    """
+
+    def test_bitmap_and(self):
+        left = _line_bitmap([1, 3, 5], 6)
+        right = _line_bitmap([1, 2, 3], 4)
+        self.assertEqual(list(_bitmap_lines(_bitmap_and(left, right))), [1, 3])
+        self.assertEqual(list(_bitmap_lines(_bitmap_and(right, left))), [1, 3])
+        self.assertEqual(len(_bitmap_and(left, right)), 4)
+
+    def test_bitmap_or(self):
+        left = _line_bitmap([1, 5], 6)
+        right = _line_bitmap([2, 3], 4)
+        self.assertEqual(list(_bitmap_lines(_bitmap_or(left, right))), [1, 2, 3, 5])
+        self.assertEqual(list(_bitmap_lines(_bitmap_or(right, left))), [1, 2, 3, 5])
+        self.assertEqual(len(_bitmap_or(left, right)), 6)
+
+    def test_empty_bitmaps(self):
+        bitmap = _line_bitmap([1, 2], 3)
+        self.assertEqual(_bitmap_and(bitmap, bytearray()), bytearray())
+        self.assertEqual(_bitmap_and(bytearray(), bytearray()), bytearray())
+        self.assertEqual(_bitmap_or(bytearray(), bitmap), bitmap)
+        self.assertEqual(_bitmap_or(bytearray(), bytearray()), bytearray())
+
+
+class UnifiedDiffTest(unittest.TestCase):
+    """
+    Tests for giving tools the changed lines as a diff.
+    """
+
+    def test_line_ranges(self):
+        self.assertEqual(base._line_ranges([]), [])
+        self.assertEqual(base._line_ranges({7, 1, 2, 3, 5}), [(1, 3), (5, 5), (7, 7)])
+
+    def test_unified_diff(self):
+        self.assertEqual(base.unified_diff({'b.py': [(4, 5)], 'a.py': [(1, 1)], 'c.py': []}), dedent("""
+            --- a/a.py
+            +++ b/a.py
+            @@ -0,0 +1,1 @@
+            +
+            --- a/b.py
+            +++ b/b.py
+            @@ -0,0 +4,2 @@
+            +
+            +
+            --- a/c.py
+            +++ b/c.py
+        """).lstrip())
+
+
+class ScannedReportTest(unittest.TestCase):
+    """
+    Tests for searching whole reports for violations at once.
+    """
+
+    REPORT = (
+        'Checking files\r\n'
+        'a.py:1:1: E225 missing whitespace\r\n'
+        'a.py:2:1: E501 line too long\n'
+        'no colon on this line\n'
+        'b.py:3:1: W291 trailing whitespace\n'
+        'a.py:4:1: W391 blank line at end of file'
+    )
+
+    def parse(self, report, changed_lines=None):
+        return dict(pycodestyle_driver.parse_reports([report], changed_lines))
+
+    def test_same_as_each_line(self):
+        expected = {
+            'a.py': [
+                Violation(1, 'E225 missing whitespace'),
+                Violation(2, 'E501 line too long'),
+                Violation(4, 'W391 blank line at end of file'),
+            ],
+            'b.py': [Violation(3, 'W291 trailing whitespace')],
+        }
+        self.assertEqual(self.parse(self.REPORT), expected)
+        self.assertEqual(self.parse(self.REPORT.splitlines(True)), expected)
+        self.assertEqual(self.parse(StringIO(self.REPORT)), expected)
+
+    def test_chunks_end_with_lines(self):
+        chunks = list(base.report_chunks(StringIO(self.REPORT), 20))
+        self.assertEqual(''.join(chunks), self.REPORT)
+        self.assertTrue(all(chunk.endswith('\n') for chunk in chunks[:-1]))
+        self.assertEqual(list(base.report_chunks(self.REPORT.splitlines(True), 20)), chunks)
+
+    def test_changed_lines(self):
+        self.assertEqual(self.parse(self.REPORT, {'a.py': {2, 4}}), {
+            'a.py': [
+                Violation(2, 'E501 line too long'),
+                Violation(4, 'W391 blank line at end of file'),
+            ],
+        })
+        self.assertEqual(self.parse(self.REPORT, {}), {})
+
+
+class ProbeToolTest(unittest.TestCase):
+    """
+    Tests for finding out whether quality tools are installed.
+    """
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.addCleanup(patch.stopall)
+        self.cache = ResultCache(os.path.join(self.temp_dir, 'cache'))
+        self.executable = os.path.join(self.temp_dir, 'pycodestyle')
+        open(self.executable, 'w').close()
+        self.which = patch.object(base, 'which', return_value=self.executable).start()
+        self.installed = patch.object(pycodestyle_driver, 'installed', return_value=True).start()
+        self.probe = patch.object(pycodestyle_driver, 'probe', return_value=(True, '2.4.0')).start()
+
+    def test_without_cache(self):
+        self.assertEqual(base.probe_tool(pycodestyle_driver), (True, None))
+        self.assertEqual(base.probe_tool(pycodestyle_driver), (True, None))
+        self.assertEqual(self.installed.call_count, 2)
+        self.assertFalse(self.probe.called)
+
+    def test_installed_cached(self):
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(self.probe.call_count, 1)
+        self.which.assert_called_with('pycodestyle')
+
+    def test_not_installed_not_cached(self):
+        self.probe.return_value = (False, None)
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (False, None))
+        self.probe.return_value = (True, '2.4.0')
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+
+    def test_not_on_path(self):
+        # The driver's own check decides
+        self.which.return_value = None
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(self.probe.call_count, 2)
+
+    def test_launchers_not_cached(self):
+        # Upgrading the tool would not change the executable
+        driver = Mock(command_to_check_install=['java', 'com.puppycrawl.tools.checkstyle.Main', '-version'])
+        driver.probe.return_value = (True, '8.0')
+        self.which.return_value = os.path.join(self.temp_dir, 'java')
+        self.assertEqual(base.probe_tool(driver, self.cache), (True, '8.0'))
+        self.assertEqual(base.probe_tool(driver, self.cache), (True, '8.0'))
+        self.assertEqual(driver.probe.call_count, 2)
+
+        shims = os.path.join(self.temp_dir, 'shims')
+        os.mkdir(shims)
+        self.which.return_value = os.path.join(shims, 'pycodestyle')
+        open(self.which.return_value, 'w').close()
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(base.probe_tool(pycodestyle_driver, self.cache), (True, '2.4.0'))
+        self.assertEqual(self.probe.call_count, 2)
+
+    def test_probe_runs_command_once(self):
+        patch.stopall()
+        process = _setup_patch((b'2.4.0\n', b''))
+        self.assertEqual(pycodestyle_driver.probe(), (True, '2.4.0\n'))
+        process.returncode = 1
+        self.assertEqual(pycodestyle_driver.probe(), (False, None))
+        self.assertEqual(process.communicate.call_count, 2)
+
+    def test_fallback_driver(self):
+        json_driver = Mock(command_to_check_install=None)
+        json_driver.installed.return_value = True
+        quality = QualityReporter(json_driver, fallback_driver=pycodestyle_driver)
+        quality.check_installed()
+        self.assertIs(quality.driver, json_driver)
+        self.assertTrue(quality.driver_tool_installed)
+
+        # The fallback driver is used if the other's tool is missing
+        for installed in ({'return_value': False}, {'side_effect': OSError}):
+            json_driver.installed.configure_mock(**installed)
+            quality = QualityReporter(json_driver, fallback_driver=pycodestyle_driver)
+            quality.check_installed()
+            self.assertIs(quality.driver, pycodestyle_driver)
+            self.assertTrue(quality.driver_tool_installed)
+            self.assertEqual(self.installed.call_count, 1)
+            self.installed.reset_mock()
+
+    def test_reports_given(self):
+        quality = QualityReporter(pycodestyle_driver, reports=[BytesIO(b'')])
+        quality.check_installed()
+        self.assertIsNone(quality.driver_tool_installed)
+        self.assertFalse(self.installed.called)
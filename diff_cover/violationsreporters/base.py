@@ -3,16 +3,377 @@ from abc import ABCMeta, abstractmethod
 from collections import defaultdict, namedtuple
 
 
+import codecs
 import copy
+from array import array
+from bisect import bisect_left
+import math
+import multiprocessing
 
 import re
+import shlex
 import sys
 import os
 
 
-from diff_cover.command_runner import execute, run_command_for_code
+from multiprocessing.pool import ThreadPool
 
-Violation = namedtuple('Violation', 'line, message')
+import six
+
+try:
+    from importlib.util import find_spec
+except ImportError:
+    # Python 2
+    from pkgutil import find_loader as find_spec
+
+try:
+    from shutil import which
+except ImportError:
+    # Python 2
+    from distutils.spawn import find_executable as which
+
+from diff_cover.command_runner import CommandError, execute, execute_spooled, run_command_for_code
+from diff_cover.result_cache import ResultCache, file_digest
+
+
+class Violation(namedtuple('Violation', 'line, message, end_line')):
+    """
+    A violation on `line`, or, if `end_line` is given, on each of the
+    lines from `line` to `end_line`.  Tools that report a whole region
+    (such as a class) give its range, rather than a violation per line.
+    """
+    __slots__ = ()
+
+    def __new__(cls, line, message, end_line=None):
+        if end_line is None:
+            end_line = line
+        return super(Violation, cls).__new__(cls, line, message, end_line)
+
+
+class ViolationStore(object):
+    """
+    The violations found in many files, stored compactly.  Each file's
+    violations are kept in arrays of line numbers and of indexes into a
+    table of messages that all the files share, so that a message which
+    is reported a million times is only stored once.
+
+    It is used like a `defaultdict(list)` of violations keyed on source
+    path: `store[src_path]` is a `FileViolations`, and `Violation`s are
+    only created again as they are read back.
+    """
+
+    def __init__(self):
+        self._messages = []
+        self._message_ids = {}
+        self._files = {}
+
+    def message_id(self, message):
+        """
+        Return the index of `message` in the table of messages, adding it if need be.
+        """
+        message_id = self._message_ids.get(message)
+        if message_id is None:
+            message_id = self._message_ids[message] = len(self._messages)
+            self._messages.append(message)
+        return message_id
+
+    def message(self, message_id):
+        return self._messages[message_id]
+
+    def __getitem__(self, src_path):
+        violations = self._files.get(src_path)
+        if violations is None:
+            violations = self._files[src_path] = FileViolations(self)
+        return violations
+
+    def __setitem__(self, src_path, violations):
+        """
+        Replace the violations of `src_path` with `violations`.
+        """
+        if not (isinstance(violations, FileViolations) and violations.store is self):
+            file_violations = FileViolations(self)
+            file_violations.extend(violations)
+            violations = file_violations
+        self._files[src_path] = violations
+
+    def update(self, other):
+        for src_path, violations in other.items():
+            self[src_path] = violations
+
+    def get(self, src_path, default=None):
+        return self._files.get(src_path, default)
+
+    def keys(self):
+        return self._files.keys()
+
+    def items(self):
+        return self._files.items()
+
+    def __contains__(self, src_path):
+        return src_path in self._files
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+
+class FileViolations(object):
+    """
+    The violations of one file in a `ViolationStore`, which can be read
+    like a list of `Violation`s.
+    """
+    __slots__ = ('store', '_lines', '_end_lines', '_message_ids')
+
+    def __init__(self, store):
+        self.store = store
+        # array() needs a native string on Python 2
+        self._lines = array(str('i'))
+        self._end_lines = array(str('i'))
+        self._message_ids = array(str('i'))
+
+    def append(self, violation):
+        self._lines.append(violation.line)
+        self._end_lines.append(violation.end_line)
+        self._message_ids.append(self.store.message_id(violation.message))
+
+    def extend(self, violations):
+        if isinstance(violations, FileViolations):
+            # Copy the arrays rather than creating each violation
+            message_ids = violations._message_ids
+            if violations.store is not self.store:
+                message_ids = [
+                    self.store.message_id(violations.store.message(message_id))
+                    for message_id in message_ids
+                ]
+            self._lines.extend(violations._lines)
+            self._end_lines.extend(violations._end_lines)
+            self._message_ids.extend(message_ids)
+        else:
+            for violation in violations:
+                self.append(violation)
+
+    def _violation(self, index):
+        return Violation(
+            self._lines[index],
+            self.store.message(self._message_ids[index]),
+            self._end_lines[index]
+        )
+
+    def on_lines(self, lines):
+        """
+        Return a list of the violations on any of `lines`, without
+        creating the others.
+        """
+        sorted_lines = sorted(lines)
+        violations = []
+        for index, line in enumerate(self._lines):
+            position = bisect_left(sorted_lines, line)
+            if position < len(sorted_lines) and sorted_lines[position] <= self._end_lines[index]:
+                violations.append(self._violation(index))
+        return violations
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        for index in range(len(self._lines)):
+            yield self._violation(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._violation(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (FileViolations, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+# Used when the platform does not tell us its limit on the length
+# of a command line (32767 characters is the limit on Windows)
+DEFAULT_ARG_MAX = 32767
+
+
+def _max_command_length():
+    """
+    Return how many bytes of arguments we allow ourselves on one command line.
+    """
+    try:
+        arg_max = os.sysconf(str('SC_ARG_MAX'))
+    except (AttributeError, ValueError, OSError):
+        arg_max = DEFAULT_ARG_MAX
+    # The environment shares the limit with the arguments.  Keep well
+    # clear of it, since some platforms count pointers and padding too.
+    environment_size = sum(len(key) + len(value) + 2 for key, value in os.environ.items())
+    return max((arg_max - environment_size) // 2, 4096)
+
+
+def _command_chunks(command, args):
+    """
+    Split `args` into lists that can each be appended to `command`
+    without exceeding the command line length limit.
+    """
+    max_length = _max_command_length()
+    command_length = sum(len(token) + 1 for token in command)
+    chunk, chunk_length = [], command_length
+    for arg in args:
+        if chunk and chunk_length + len(arg) + 1 > max_length:
+            yield chunk
+            chunk, chunk_length = [], command_length
+        chunk.append(arg)
+        chunk_length += len(arg) + 1
+    if chunk:
+        yield chunk
+
+
+def _line_ranges(lines):
+    """
+    Return the `(first, last)` ranges of consecutive line numbers in `lines`.
+    """
+    ranges = []
+    for line in sorted(lines):
+        if ranges and ranges[-1][1] == line - 1:
+            ranges[-1] = (ranges[-1][0], line)
+        else:
+            ranges.append((line, line))
+    return ranges
+
+
+def unified_diff(line_ranges):
+    """
+    Return a unified diff that adds the lines in `line_ranges`, a dict
+    mapping source paths to `(first, last)` ranges of lines, for tools that
+    can check just the lines a diff adds.  Only the line numbers are real:
+    the lines themselves are left blank.
+    """
+    pieces = []
+    for src_path in sorted(line_ranges):
+        pieces.append('--- a/{0}\n+++ b/{0}\n'.format(src_path))
+        for first, last in line_ranges[src_path]:
+            count = last - first + 1
+            pieces.append('@@ -0,0 +{},{} @@\n'.format(first, count))
+            pieces.append('+\n' * count)
+    return ''.join(pieces)
+
+
+def normalize_path(path):
+    """
+    Return the key under which violations for `path` are stored, so that
+    spellings of the same path like `./a/b.py` and `a//b.py` (or a different
+    case, on Windows) find the same violations.
+    """
+    return os.path.normcase(os.path.normpath(path))
+
+
+def report_lines(report):
+    """
+    Return an iterator over the lines of `report`, which is either a
+    string or an iterable of lines (such as a file opened for reading
+    text).  Lines keep their line endings.
+    """
+    if isinstance(report, six.string_types):
+        return _string_lines(report)
+    return iter(report)
+
+
+def _string_lines(text):
+    # Like `text.splitlines(True)`, but without building a list of all the lines
+    start = 0
+    while start < len(text):
+        end = text.find('\n', start) + 1 or len(text)
+        yield text[start:end]
+        start = end
+
+
+def report_chunks(report, size=1 << 20):
+    """
+    Yield the text of `report` (as taken by `report_lines()`) in pieces of
+    about `size` characters, each ending at the end of a line.
+    """
+    if isinstance(report, six.string_types):
+        yield report
+        return
+    if hasattr(report, 'read') and hasattr(report, 'readline'):
+        chunk = report.read(size)
+        while chunk:
+            yield chunk + report.readline()
+            chunk = report.read(size)
+        return
+    chunk, length = [], 0
+    for line in report:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(chunk)
+            chunk, length = [], 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def in_diff(changed_lines, src_path):
+    """
+    Return whether `src_path` is in the diff described by `changed_lines`,
+    as passed to `QualityDriver.parse_reports()`.
+    """
+    return changed_lines is None or normalize_path(src_path) in changed_lines
+
+
+def on_changed_line(changed_lines, src_path, line_number):
+    """
+    Return whether `line_number` of `src_path` is in the diff described
+    by `changed_lines`, as passed to `QualityDriver.parse_reports()`.
+    """
+    if changed_lines is None:
+        return True
+    lines = changed_lines.get(normalize_path(src_path), ())
+    return lines is None or line_number in lines
+
+
+def report_line_filter(changed_lines):
+    """
+    Return a function that tells quickly whether a line of a report can
+    be about one of the files in `changed_lines` (as passed to
+    `QualityDriver.parse_reports()`), because the line mentions the file's
+    name, or None if any line can be.
+
+    This is only a first test: lines that pass it may still be about
+    other files with the same name.
+    """
+    if changed_lines is None:
+        return None
+    names = sorted({os.path.basename(src_path) for src_path in changed_lines}, key=len, reverse=True)
+    if not names:
+        # Nothing to find
+        return re.compile('(?!)').search
+    # Paths are normalized to lower case where case does not matter
+    flags = re.IGNORECASE if os.path.normcase('A') != 'A' else 0
+    return re.compile('|'.join(re.escape(name) for name in names), flags).search
+
+
+def _shards(items, count):
+    """
+    Split `items` into at most `count` contiguous lists of similar size.
+    """
+    if not items:
+        return []
+    shard_size = int(math.ceil(len(items) / float(count)))
+    return [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
 
 
 class QualityReporterError(Exception):
@@ -35,6 +396,7 @@ class BaseViolationReporter(object):
         in the generated diff report.
         """
         self._name = name
+        self._changed_lines = None
 
     @abstractmethod
     def violations(self, src_path):
@@ -56,6 +418,28 @@ class BaseViolationReporter(object):
         """
         return None
 
+    def set_changed_lines(self, changed_lines):
+        """
+        Tell the reporter which lines the diff changed, as a dict
+        mapping every changed source path to its changed line numbers.
+
+        Reporters can use this to skip work for files and lines outside
+        the diff.  It is purely an optimization: the violations and measured
+        lines reported for changed lines must not depend on it.
+        """
+        self._changed_lines = {
+            src_path: set(lines) for src_path, lines in changed_lines.items()
+        }
+
+    def _lines_of_interest(self, src_path):
+        """
+        Return the set of changed lines in `src_path`, or None
+        if the reporter has not been told what the diff changed.
+        """
+        if self._changed_lines is None:
+            return None
+        return self._changed_lines.get(src_path, set())
+
     def name(self):
         """
         Retrieve the name of the report, which may be
@@ -70,7 +454,7 @@ class BaseViolationReporter(object):
 class QualityDriver(object):
     __metaclass__ = ABCMeta
 
-    def __init__(self, name, supported_extensions, command, exit_codes=[0]):
+    def __init__(self, name, supported_extensions, command, exit_codes=[0], config_files=None):
         """
         Args:
             name: (str) name of the driver
@@ -78,17 +462,30 @@ class QualityDriver(object):
                 Example: py, js
             command: (list[str]) list of tokens that are the command to be executed
                 to create a report
+            config_files: (list[str]) configuration files the tool reads from
+                the working directory; cached results are discarded when they change
         """
         self.name = name
         self.supported_extensions = supported_extensions
         self.command = command
         self.exit_codes = exit_codes
+        self.config_files = config_files or []
+        # Whether the tool compares files with each other (like pylint's
+        # duplicate code check), so all files must be checked in one run
+        self.checks_across_files = False
 
     @abstractmethod
-    def parse_reports(self, reports):
+    def parse_reports(self, reports, changed_lines=None):
         """
         Args:
-            reports: list[str] - output from the report
+            reports: list - output from the tool or pre-generated reports, each
+                either a string or an iterable of lines (see `report_lines()`)
+            changed_lines: dict[str:set[int]] - the lines changed by the diff,
+                keyed on normalized source path (see `normalize_path()`), or
+                None if not known.  A file's lines are None if all of its
+                violations are wanted.  Drivers may leave out violations in
+                other files and on other lines (see `in_diff()` and
+                `on_changed_line()`); this is only an optimization.
         Return:
             A dict[Str:Violation]
             Violation is a simple named tuple Defined above
@@ -103,67 +500,567 @@ class QualityDriver(object):
         """
         pass
 
+    def range_command(self, command, line_ranges):
+        """
+        Args:
+            command: list[str] - the tool's command, with its options
+            line_ranges: dict[str:list[tuple]] - the `(first, last)` ranges
+                of lines to check in each source file
+        Return:
+            A `(command, stdin)` tuple to run the tool on only those lines,
+            where stdin is text to give the tool (or None), or None if
+            the tool can only check whole files.
+        """
+        return None
+
+    def version(self):
+        """
+        Returns: (str) the version output of the installed tool, or None
+        if it cannot be determined.  Used to discard cached results
+        when the tool is upgraded.
+        """
+        command = getattr(self, 'command_to_check_install', None)
+        if not command:
+            return None
+        try:
+            stdout, stderr = execute(command)
+        except (CommandError, OSError):
+            return None
+        return stdout + stderr
+
+    def probe(self):
+        """
+        Returns: a tuple of whether the tool is installed and, if it is,
+        its version (see `version()`).  Drivers that can find out both from
+        one run of the tool override this.
+        """
+        installed = self.installed()
+        return installed, (self.version() if installed else None)
+
+
+def probe_command(command):
+    """
+    Run `command`, which succeeds if a tool is installed, and return a tuple
+    of whether it succeeded and, if it did, its output (which, for commands
+    like `tool --version`, is the tool's version).  This is the same as
+    `QualityDriver.installed()` and `version()` for drivers that check
+    with a command, but runs the command only once.
+    """
+    try:
+        stdout, stderr = execute(command)
+    except CommandError:
+        return False, None
+    return True, stdout + stderr
+
+
+class InProcessDriver(QualityDriver):
+    """
+    Driver for a tool written in Python, which calls the tool's API
+    directly instead of running its command and parsing the output.
+
+    `QualityReporter` runs `check()` in a pool of worker processes, which
+    keeps whatever global state the tool has out of this process.  The
+    workers import the tool once, and are reused for each batch of files
+    until the reporter is closed.
+    """
+
+    def __init__(self, report_driver, module):
+        """
+        Args:
+            report_driver: (QualityDriver) the driver that runs the tool's
+                command, used to parse pre-generated reports
+            module: (str) the tool's top level module
+        """
+        super(InProcessDriver, self).__init__(
+            report_driver.name,
+            report_driver.supported_extensions,
+            report_driver.command,
+            report_driver.exit_codes,
+            report_driver.config_files
+        )
+        self.report_driver = report_driver
+        self.module = module
+        self.checks_across_files = report_driver.checks_across_files
+
+    @abstractmethod
+    def check(self, src_paths, options):
+        """
+        Args:
+            src_paths: list[str] - files to check
+            options: list[str] - command line options for the tool
+        Return:
+            A dict[Str:Violation]
+        """
+        pass
+
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+        """
+        return self.report_driver.parse_reports(reports, changed_lines)
+
+    def installed(self):
+        """
+        Method checks if the tool can be imported.
+        Returns: boolean True if installed
+        """
+        return find_spec(self.module) is not None
+
+    def version(self):
+        """
+        See base class docstring.
+        """
+        try:
+            return getattr(__import__(self.module), '__version__', None)
+        except ImportError:
+            return None
+
+
+# Executables that only start a tool, and so do not change when the tool is
+# upgraded: interpreters (Checkstyle is run by `java`, with the tool found
+# on the CLASSPATH), and the shims that version managers such as pyenv and
+# asdf install in a `shims` directory, which run whichever version is chosen
+LAUNCHERS = ('java', 'node', 'python', 'python2', 'python3')
+SHIMS_DIRECTORY = 'shims'
+
+
+def _is_launcher(executable):
+    """
+    Return True if `executable` only starts the tool (see `LAUNCHERS`).
+    """
+    name = os.path.splitext(os.path.basename(executable))[0].lower()
+    directory = os.path.basename(os.path.dirname(os.path.realpath(executable)))
+    return name in LAUNCHERS or directory == SHIMS_DIRECTORY
+
+
+def probe_tool(driver, cache=None):
+    """
+    Return a tuple of whether `driver`'s tool is installed and, if
+    `cache` (a `ResultCache`) is given, the tool's version (see
+    `QualityDriver.version()`), which is otherwise None.
+
+    Finding out means running the tool, which can take a while (seconds,
+    for tools that start a JVM).  So if the tool's executable can be found
+    on the PATH, the answer is kept in `cache`, keyed on the executable's
+    path and modification time, which change when the tool is reinstalled.
+    Only installed tools are remembered, so a newly installed tool is
+    noticed straight away.  Tools started by a launcher, whose executable
+    stays the same when they are upgraded (see `LAUNCHERS`), are always run.
+    """
+    if cache is None:
+        return driver.installed(), None
+
+    command = getattr(driver, 'command_to_check_install', None)
+    executable = which(command[0]) if command else None
+    if executable is not None and _is_launcher(executable):
+        executable = None
+    if executable is not None:
+        try:
+            mtime = os.stat(executable).st_mtime
+        except OSError:
+            executable = None
+    if executable is None:
+        return driver.probe()
+
+    key = ResultCache.tool_key(
+        'installed', type(driver).__name__, driver.name, executable, mtime, *command
+    )
+    probe = cache.load(key)
+    if probe is not None:
+        return True, probe['version']
+
+    installed, version = driver.probe()
+    if installed:
+        cache.store(key, {'version': version})
+    return installed, version
+
+
+def _import_in_worker(module):
+    """
+    Import the tool when a pool worker starts, rather than when it is
+    given its first files.
+    """
+    try:
+        __import__(module)
+    except ImportError:
+        # Reported when the tool is run; a worker that fails
+        # to start would only be started again by the pool
+        pass
+
+
+def _check_in_worker(args):
+    """
+    Run `InProcessDriver.check()` in a pool worker.
+    """
+    driver, src_paths, options = args
+    return driver.check(src_paths, options)
+
 
 class QualityReporter(BaseViolationReporter):
 
-    def __init__(self, driver, reports=None, options=None):
+    def __init__(self, driver, reports=None, options=None, jobs=1, cache=None, spool=False,
+                 fallback_driver=None):
         """
         Args:
             driver (QualityDriver) object that works with the underlying quality tool
             reports (list[file]) pre-generated reports. If not provided the tool will be run instead.
             options (str) options to be passed into the command
+            jobs (int) number of copies of the tool to run at the same time
+            cache (ResultCache) where to keep the tool's results between runs
+            spool (bool) write the tool's output to temporary files, which are
+                parsed as they are read, instead of keeping it in memory
+            fallback_driver (QualityDriver) driver to use instead if `driver`'s
+                tool turns out not to be installed, such as the text driver
+                for a tool whose JSON output needs a plugin
         """
         super(QualityReporter, self).__init__(driver.name)
         self.reports = self._load_reports(reports) if reports else None
-        self.violations_dict = defaultdict(list)
+        self.reports_parsed = False
+
+        # Keys are normalized source paths (see `normalize_path()`)
+        self.violations_dict = ViolationStore()
         self.driver = driver
+        self.fallback_driver = fallback_driver
         self.options = options
+        self.jobs = jobs
+        self.cache = cache
+        self.spool = spool
         self.driver_tool_installed = None
+        self._driver_version = None
+        self._tool_key = None
+        # Pools of worker processes for an `InProcessDriver`,
+        # each with the number of workers in it
+        self._workers = []
+
+        # Source paths the tool has already been run on
+        self._linted_paths = set()
 
     def _load_reports(self, report_files):
         """
         Args:
             report_files: list[file] reports to read in
+        Return:
+            The reports, decoded as they are read, a line at a time
         """
-        contents = []
-        for file_handle in report_files:
-            # Convert to unicode, replacing unreadable chars
-            contents.append(
-                file_handle.read().decode(
-                    'utf-8',
-                    'replace'
-                )
-            )
-        return contents
+        # Replace unreadable chars
+        return [codecs.getreader('utf-8')(file_handle, 'replace') for file_handle in report_files]
+
+    def _is_supported(self, src_path):
+        # Drivers for reports from any tool support every file
+        if self.driver.supported_extensions is None:
+            return True
+        # The same test as the diff reporter's
+        extension = os.path.splitext(src_path)[1][1:].lower()
+        return extension in self.driver.supported_extensions
+
+    def _normalized_changed_lines(self, whole_files=False):
+        """
+        Return the changed lines in the form expected by
+        `QualityDriver.parse_reports()`.  If `whole_files` is set,
+        only the changed files are given, with all of their lines.
+        """
+        if self._changed_lines is None:
+            return None
+        return {
+            normalize_path(src_path): None if whole_files else lines
+            for src_path, lines in self._changed_lines.items()
+        }
 
     def violations(self, src_path):
         """
         Return a list of Violations recorded in `src_path`.
         """
-        if not any(src_path.endswith(ext) for ext in self.driver.supported_extensions):
+        if not self._is_supported(src_path):
             return []
-        if src_path not in self.violations_dict:
-            if self.reports:
-                self.violations_dict = self.driver.parse_reports(self.reports)
+        if self.reports:
+            if not self.reports_parsed:
+                self.violations_dict = self._index_violations(
+                    self.driver.parse_reports(self.reports, self._normalized_changed_lines())
+                )
+                self.reports_parsed = True
+        elif src_path not in self._linted_paths:
+            src_paths = self._paths_to_lint(src_path)
+            if self.cache is not None:
+                self._run_tool_cached(src_paths)
             else:
-                if self.driver_tool_installed is None:
-                    self.driver_tool_installed = self.driver.installed()
-                if not self.driver_tool_installed:
-                    raise EnvironmentError("{} is not installed".format(self.driver.name))
-                command = copy.deepcopy(self.driver.command)
-                if self.options:
-                    command.append(self.options)
-                if os.path.exists(src_path):
-                    command.append(src_path.encode(sys.getfilesystemencoding()))
-                    output, _ = execute(command, self.driver.exit_codes)
-                    self.violations_dict.update(self.driver.parse_reports([output]))
-
-        return self.violations_dict[src_path]
+                self._run_tool(src_paths)
+
+        violations = self.violations_dict.get(normalize_path(src_path))
+        if violations is None:
+            return []
+        # Only create the violations that can be on changed lines
+        lines = self._lines_of_interest(src_path)
+        return list(violations) if lines is None else violations.on_lines(lines)
+
+    @staticmethod
+    def _index_violations(violations_dict):
+        """
+        Re-key the driver's `{path: [Violation]}` output by normalized
+        path, in a `ViolationStore`.
+        """
+        index = ViolationStore()
+        for src_path, violations in violations_dict.items():
+            index[normalize_path(src_path)].extend(violations)
+        return index
+
+    def _paths_to_lint(self, src_path):
+        """
+        Return `src_path` followed by every other changed source path the
+        tool can check and has not checked yet, so that a single run of the
+        tool covers the whole diff.
+        """
+        src_paths = [src_path]
+        if self._changed_lines is not None:
+            src_paths.extend(sorted(
+                path for path in self._changed_lines
+                if path != src_path and path not in self._linted_paths and self._is_supported(path)
+            ))
+        return src_paths
+
+    def check_installed(self):
+        """
+        Find out whether the tool is installed (and, if its results are
+        cached, its version), unless we already know, switching to the
+        fallback driver if it is not.  This is safe to do in another
+        thread, while waiting for something else.
+        """
+        if self.reports or self.driver_tool_installed is not None:
+            return
+        if self.fallback_driver is not None:
+            try:
+                installed, version = probe_tool(self.driver, self.cache)
+            except OSError:
+                installed, version = False, None
+            if installed:
+                self.driver_tool_installed, self._driver_version = installed, version
+                return
+            self.driver, self.fallback_driver = self.fallback_driver, None
+        self.driver_tool_installed, self._driver_version = probe_tool(self.driver, self.cache)
+
+    def start_workers(self, src_paths=None):
+        """
+        Start worker processes for an `InProcessDriver`, so that they can
+        import the tool while we wait for something else: one, or if the
+        `src_paths` to check are given, one for each shard of those the
+        tool supports.  The workers are kept until `close()` is called,
+        so later checks do not have to start them again.
+
+        Only one worker is started before the diff is known; the rest are
+        added once it is.  Forking while other threads are running can
+        deadlock, so callers that run tools in threads should start all of
+        the workers they need beforehand, from the main thread.
+        """
+        if self.reports or not isinstance(self.driver, InProcessDriver):
+            return
+        started = sum(size for _, size in self._workers)
+        if src_paths is None:
+            count = 1
+        else:
+            count = len(_shards([src_path for src_path in src_paths if self._is_supported(src_path)],
+                                self._shard_count()))
+        if count > started:
+            pool = multiprocessing.Pool(count - started, _import_in_worker, (self.driver.module,))
+            self._workers.append((pool, count - started))
+
+    def close(self):
+        """
+        Stop the worker processes, if any were started.
+        """
+        for pool, _ in self._workers:
+            pool.close()
+            pool.join()
+        self._workers = []
+
+    def _shard_count(self):
+        """
+        Return how many shards to split the files to check into: one for
+        each job, unless the tool compares files with each other, which
+        it can only do for the files it checks together.
+        """
+        return 1 if self.driver.checks_across_files else self.jobs
+
+    def _run_tool(self, src_paths):
+        """
+        Run the quality tool on `src_paths` and record the violations found.
+
+        The paths are split into shards (see `_shard_count()`) that are
+        checked by concurrent runs of the tool, each using as few
+        invocations as the platform's command line length limit allows.
+        """
+        self.check_installed()
+        if not self.driver_tool_installed:
+            raise EnvironmentError("{} is not installed".format(self.driver.name))
+
+        if isinstance(self.driver, InProcessDriver):
+            violations_dict = self._check_in_process(
+                [src_path for src_path in src_paths if os.path.exists(src_path)]
+            )
+            self.violations_dict.update(self._index_violations(violations_dict))
+            self._linted_paths.update(src_paths)
+            return
+
+        command = copy.deepcopy(self.driver.command)
+        if self.options:
+            command.append(self.options)
+
+        existing_paths = [src_path for src_path in src_paths if os.path.exists(src_path)]
+        runs = self._range_runs(command, existing_paths)
+        if runs is None:
+            runs = [
+                (command + chunk, None)
+                for shard in _shards(existing_paths, self._shard_count())
+                for chunk in _command_chunks(command, [
+                    src_path.encode(sys.getfilesystemencoding()) for src_path in shard
+                ])
+            ]
+
+        def run(args):
+            run_command, stdin = args
+            if self.spool:
+                return execute_spooled(run_command, self.driver.exit_codes, stdin)[0]
+            return execute(run_command, self.driver.exit_codes, stdin)[0]
+
+        if self.jobs > 1 and len(runs) > 1:
+            pool = ThreadPool(min(self.jobs, len(runs)))
+            try:
+                # Outputs come back in submission order, so the
+                # result does not depend on which run finished first
+                outputs = pool.map(run, runs)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            outputs = [run(args) for args in runs]
+
+        try:
+            if outputs:
+                # Cached results must hold every violation in their files
+                changed_lines = self._normalized_changed_lines(whole_files=self.cache is not None)
+                self.violations_dict.update(self._index_violations(
+                    self.driver.parse_reports(outputs, changed_lines)
+                ))
+        finally:
+            if self.spool:
+                for output in outputs:
+                    output.close()
+        self._linted_paths.update(src_paths)
+
+    def _range_runs(self, command, src_paths):
+        """
+        Return the `(command, stdin)` runs that check only the changed lines
+        of `src_paths`, one for each shard (see `_shard_count()`), or None if the
+        tool has to check whole files.
+
+        Cached results must hold every violation in their files,
+        so tools are only run on changed lines without a cache.
+        """
+        if self.cache is not None or self._changed_lines is None:
+            return None
+        runs = []
+        for shard in _shards(src_paths, self._shard_count()):
+            run = self.driver.range_command(command, {
+                src_path: _line_ranges(self._changed_lines.get(src_path, ()))
+                for src_path in shard
+            })
+            if run is None:
+                return None
+            runs.append(run)
+        return runs
+
+    def _check_in_process(self, src_paths):
+        """
+        Check `src_paths` with an `InProcessDriver`, spreading
+        them over the worker processes.
+        """
+        violations_dict = defaultdict(list)
+        shards = _shards(src_paths, self._shard_count())
+        if not shards:
+            return violations_dict
+
+        options = shlex.split(self.options) if self.options else []
+        # Even a single shard goes to a worker, to keep
+        # the tool's global state out of this process
+        self.start_workers(src_paths)
+        # There is a worker for each shard, in one pool or another
+        workers = [pool for pool, size in self._workers for _ in range(size)]
+        results = [
+            workers[index].apply_async(_check_in_worker, ((self.driver, shard, options),))
+            for index, shard in enumerate(shards)
+        ]
+
+        for result in (result.get() for result in results):
+            for src_path, violations in result.items():
+                violations_dict[src_path].extend(violations)
+        return violations_dict
+
+    def _run_tool_cached(self, src_paths):
+        """
+        Like `_run_tool()`, but take the violations of files that have
+        not changed since a previous run from the cache, and only run the
+        tool on the rest.
+
+        A tool that compares files with each other can find new violations
+        in a file when another file changes, so its results are only reused
+        if none of the files it is run on have changed, and otherwise it is
+        run on all of them again.
+        """
+        if self._tool_key is None:
+            self.check_installed()
+            self._tool_key = ResultCache.tool_key(
+                self.driver.name,
+                self._driver_version,
+                self.options,
+                *[
+                    '{}={}'.format(config_file, file_digest(config_file))
+                    for config_file in self.driver.config_files
+                ]
+            )
+
+        digests = [(src_path, file_digest(src_path)) for src_path in src_paths]
+        tool_key = self._tool_key
+        if self.driver.checks_across_files:
+            tool_key = ResultCache.tool_key(tool_key, *sorted(
+                '{}={}'.format(normalize_path(src_path), contents_digest)
+                for src_path, contents_digest in digests
+            ))
+
+        misses = {}
+        hits = {}
+        for src_path, contents_digest in digests:
+            if contents_digest is None:
+                # Let the tool decide what to do about unreadable files
+                misses[src_path] = None
+                continue
+            key = ResultCache.entry_key(tool_key, normalize_path(src_path), contents_digest)
+            cached = self.cache.get(key)
+            if cached is None:
+                misses[src_path] = key
+            else:
+                hits[src_path] = (key, cached)
+
+        if misses and self.driver.checks_across_files:
+            misses.update((src_path, key) for src_path, (key, _) in hits.items())
+            hits = {}
+        for src_path, (_, cached) in hits.items():
+            self.violations_dict[normalize_path(src_path)] = [Violation(*fields) for fields in cached]
+            self._linted_paths.add(src_path)
+
+        if not misses:
+            return
+
+        self._run_tool(sorted(misses, key=src_paths.index))
+        for src_path, key in misses.items():
+            if key is not None:
+                self.cache.set(key, self.violations_dict.get(normalize_path(src_path), []))
+        self.cache.prune()
 
     def measured_lines(self, src_path):
         """
-        Quality Reports Consider all lines measured
+        Quality Reports Consider all lines measured, in the files
+        the tool can check
         """
+        if not self._is_supported(src_path):
+            return []
         return None
 
     def name(self):
@@ -177,6 +1074,49 @@ class QualityReporter(BaseViolationReporter):
         return self._name
 
 
+class CombinedQualityReporter(BaseViolationReporter):
+    """
+    Report the violations found by several quality tools as one.
+    """
+
+    def __init__(self, reporters):
+        """
+        Args:
+            reporters (list[QualityReporter]) reporters for each of the tools
+        """
+        super(CombinedQualityReporter, self).__init__(
+            ', '.join(reporter.name() for reporter in reporters)
+        )
+        self.reporters = reporters
+
+    def set_changed_lines(self, changed_lines):
+        """
+        See base class docstring.
+        """
+        super(CombinedQualityReporter, self).set_changed_lines(changed_lines)
+        for reporter in self.reporters:
+            reporter.set_changed_lines(changed_lines)
+
+    def violations(self, src_path):
+        """
+        Return the violations every tool found in `src_path`,
+        with each message prefixed by the name of its tool.
+        """
+        return [
+            violation._replace(message='{}: {}'.format(reporter.name(), violation.message))
+            for reporter in self.reporters
+            for violation in reporter.violations(src_path)
+        ]
+
+    def measured_lines(self, src_path):
+        """
+        All lines are measured in files that at least one tool can check.
+        """
+        if any(reporter.measured_lines(src_path) is None for reporter in self.reporters):
+            return None
+        return []
+
+
 class RegexBasedDriver(QualityDriver):
     def __init__(
             self,
@@ -186,50 +1126,157 @@ class RegexBasedDriver(QualityDriver):
             expression,
             command_to_check_install,
             flags=0,
-            exit_codes=[0]
+            exit_codes=[0],
+            config_files=None,
+            message_expression=None,
+            diff_options=None
     ):
         """
         args:
             expression: regex used to parse report, will be fed lines singly
                         unless flags contain re.MULTILINE
             flags: such as re.MULTILINE
+            message_expression: regex for tools that report each violation
+                        on two lines.  If given, `expression` matches the first
+                        line (capturing the path and line number) and this
+                        matches the line after it (capturing the message).
+            diff_options: (list[str]) options that make the tool read a unified
+                        diff from stdin and check only the lines it adds,
+                        for tools that can be run on just the changed lines
         See super for other args
             command_to_check_install: (list[str]) command to run
             to see if the tool is installed
         """
-        super(RegexBasedDriver, self).__init__(name, supported_extensions, command, exit_codes)
+        super(RegexBasedDriver, self).__init__(name, supported_extensions, command, exit_codes, config_files)
         self.expression = re.compile(expression, flags)
+        self.message_expression = re.compile(message_expression) if message_expression else None
+        # Expressions anchored to the start of a line can be searched for in
+        # many lines at once, instead of being matched against each line
+        if self.expression.pattern.startswith('^'):
+            self._line_expression = re.compile(expression, flags | re.MULTILINE)
+        else:
+            self._line_expression = None
+        self.diff_options = diff_options
         self.command_to_check_install = command_to_check_install
         self.is_installed = None
 
-    def parse_reports(self, reports):
+    def parse_reports(self, reports, changed_lines=None):
         """
-        Args:
-            reports: list[str] - output from the report
-        Return:
-            A dict[Str:Violation]
-            Violation is a simple named tuple Defined above
+        See base class docstring.
         """
-        violations_dict = defaultdict(list)
+        violations_dict = ViolationStore()
+        # Each path is resolved once, however many violations are in it
+        paths = {}
+        mentions_changed_file = report_line_filter(changed_lines)
         for report in reports:
-            if self.expression.flags & re.MULTILINE:
-                matches = (match for match in
-                           re.finditer(self.expression, report))
-            else:
-                matches = (self.expression.match(line) for line in
-                           report.split('\n'))
-            for match in matches:
-                if match is not None:
-                    src, line_number, message = match.groups()
+            for src, line_number, message in self._records(report, mentions_changed_file):
+                path = paths.get(src)
+                if path is None:
                     # Transform src to a relative path, if it isn't already
-                    src = os.path.relpath(src)
-                    violation = Violation(int(line_number), message)
-                    violations_dict[src].append(violation)
+                    src_path = os.path.relpath(src)
+                    if changed_lines is None:
+                        lines = None
+                    else:
+                        lines = changed_lines.get(normalize_path(src_path), ())
+                    path = paths[src] = (src_path, lines)
+                src_path, lines = path
+                line_number = int(line_number)
+                if lines is None or line_number in lines:
+                    violations_dict[src_path].append(Violation(line_number, message))
         return violations_dict
 
+    def _records(self, report, mentions_changed_file=None):
+        """
+        Return an iterator over a `(src, line_number, message)` tuple
+        for each violation in `report`, leaving out lines that
+        `mentions_changed_file` (see `report_line_filter()`) does not find
+        if it is given.
+        """
+        if self.expression.flags & re.MULTILINE:
+            # Matches can span lines, so we need the whole report
+            return (match.groups() for match in
+                    re.finditer(self.expression, ''.join(report_lines(report))))
+        lines = (line.rstrip('\r\n') for line in report_lines(report))
+        if self.message_expression is not None:
+            return self._two_line_records(lines)
+        if self._line_expression is None:
+            if mentions_changed_file is not None:
+                lines = (line for line in lines if mentions_changed_file(line))
+            return (match.groups() for match in
+                    (self.expression.match(line) for line in lines)
+                    if match is not None)
+        return self._scanned_records(report, mentions_changed_file)
+
+    def _scanned_records(self, report, mentions_changed_file=None):
+        """
+        Yield the same records as matching the expression against each line
+        of `report`, but search whole pieces of the report at a time.
+
+        If `mentions_changed_file` is given (see `report_line_filter()`),
+        only lines it finds are matched.
+        """
+        search = self._line_expression.search
+        match = self._line_expression.match
+        for chunk in report_chunks(report):
+            if '\r' in chunk:
+                chunk = chunk.replace('\r\n', '\n')
+            position = 0
+            while True:
+                if mentions_changed_file is None:
+                    found = search(chunk, position)
+                    if found is None:
+                        break
+                    start = found.start()
+                else:
+                    mention = mentions_changed_file(chunk, position)
+                    if mention is None:
+                        break
+                    found = None
+                    start = chunk.rfind('\n', position, mention.start()) + 1 or position
+                line_end = chunk.find('\n', start)
+                if line_end == -1:
+                    line_end = len(chunk)
+                if found is None or found.end() > line_end:
+                    # Match the line by itself, as a match found by searching
+                    # may have run on into the next lines
+                    found = match(chunk, start, line_end)
+                if found is not None:
+                    yield found.groups()
+                position = line_end + 1
+
+    def range_command(self, command, line_ranges):
+        """
+        See base class docstring.
+        """
+        if self.diff_options is None:
+            return None
+        return command + self.diff_options, unified_diff(line_ranges)
+
+    def _two_line_records(self, lines):
+        """
+        Yield a `(src, line_number, message)` tuple for each header line
+        in `lines` that is directly followed by a message line, in a
+        single pass over the lines.
+        """
+        header = None
+        for line in lines:
+            match = self.message_expression.match(line) if header else None
+            if match is not None:
+                yield header + match.groups()
+                header = None
+            else:
+                match = self.expression.match(line)
+                header = match.groups() if match else None
+
     def installed(self):
         """
         Method checks if the provided tool is installed.
         Returns: boolean True if installed
         """
         return run_command_for_code(self.command_to_check_install) == 0
+
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        return probe_command(self.command_to_check_install)
@@ -0,0 +1,171 @@
+"""
+Drivers that run Python quality tools through their APIs, in worker
+processes, rather than through their console scripts.
+
+The tools are only imported in the workers, when they are needed.
+"""
+from __future__ import unicode_literals
+
+import os
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+
+from diff_cover.violationsreporters.base import InProcessDriver, Violation
+from diff_cover.violationsreporters.violations_reporter import (
+    pycodestyle_driver, pyflakes_driver, pydocstyle_driver, ModulePaths, PylintDriver
+)
+
+
+@contextmanager
+def _command_line(argv):
+    """
+    Set `sys.argv` to `argv` for tools that only read their options (and,
+    through them, their configuration files) from the command line.  This
+    is only safe because the drivers run in worker processes of our own.
+    """
+    old_argv = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = old_argv
+
+
+class PycodestyleInProcessDriver(InProcessDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(PycodestyleInProcessDriver, self).__init__(pycodestyle_driver, 'pycodestyle')
+
+    def check(self, src_paths, options):
+        """
+        See base class docstring.
+        """
+        import pycodestyle
+
+        violations_dict = defaultdict(list)
+
+        class CollectingReport(pycodestyle.BaseReport):
+            def error(self, line_number, offset, text, check):
+                code = super(CollectingReport, self).error(line_number, offset, text, check)
+                # Errors that are ignored or expected return None
+                if code:
+                    violations_dict[os.path.relpath(self.filename)].append(
+                        Violation(line_number, text)
+                    )
+                return code
+
+        with _command_line(['pycodestyle'] + options + src_paths):
+            style = pycodestyle.StyleGuide(parse_argv=True)
+        style.init_report(CollectingReport)
+        style.check_files()
+        return violations_dict
+
+
+class PyflakesInProcessDriver(InProcessDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(PyflakesInProcessDriver, self).__init__(pyflakes_driver, 'pyflakes')
+
+    def check(self, src_paths, options):
+        """
+        See base class docstring.  pyflakes has no options.
+        """
+        from pyflakes import api
+
+        reporter = _PyflakesReporter()
+        for src_path in src_paths:
+            api.checkPath(src_path, reporter)
+        return reporter.violations_dict
+
+
+class _PyflakesReporter(object):
+    """
+    Collects what pyflakes finds, in place of `pyflakes.reporter.Reporter`.
+    """
+
+    def __init__(self):
+        self.violations_dict = defaultdict(list)
+
+    def unexpectedError(self, filename, msg):
+        # The console script reports these without a line number, so
+        # they never appeared in the report either
+        pass
+
+    def syntaxError(self, filename, msg, lineno, offset, text):
+        self.violations_dict[os.path.relpath(filename)].append(Violation(lineno, msg))
+
+    def flake(self, message):
+        self.violations_dict[os.path.relpath(message.filename)].append(
+            Violation(message.lineno, message.message % message.message_args)
+        )
+
+
+class PydocstyleInProcessDriver(InProcessDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(PydocstyleInProcessDriver, self).__init__(pydocstyle_driver, 'pydocstyle')
+
+    def check(self, src_paths, options):
+        """
+        See base class docstring.
+        """
+        from pydocstyle import check
+        from pydocstyle.config import ConfigurationParser
+
+        conf = ConfigurationParser()
+        with _command_line(['pydocstyle'] + options + src_paths):
+            conf.parse()
+
+        violations_dict = defaultdict(list)
+        for files_to_check in conf.get_files_to_check():
+            # Newer versions of pydocstyle pass more settings along
+            filename, checked_codes = files_to_check[:2]
+            settings = dict(zip(
+                ('ignore_decorators', 'property_decorators', 'ignore_self_only_init'),
+                files_to_check[2:]
+            ))
+            for error in check((filename,), select=checked_codes, **settings):
+                # Errors without a code are problems reading the file
+                if getattr(error, 'code', None):
+                    violations_dict[os.path.relpath(error.filename)].append(
+                        Violation(error.line, error.message)
+                    )
+        return violations_dict
+
+
+class PylintInProcessDriver(InProcessDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(PylintInProcessDriver, self).__init__(PylintDriver(), 'pylint')
+
+    def check(self, src_paths, options):
+        """
+        See base class docstring.
+        """
+        from pylint.lint import Run
+        from pylint.reporters import CollectingReporter
+
+        reporter = CollectingReporter()
+        try:
+            Run(options + src_paths, reporter=reporter, exit=False)
+        except TypeError:
+            # pylint < 2.5
+            Run(options + src_paths, reporter=reporter, do_exit=False)
+
+        violations_dict = defaultdict(list)
+        module_paths = ModulePaths(src_paths)
+        for message in reporter.messages:
+            for src_path, violation in self.report_driver.message_violations(
+                    message.path, message.line, message.msg_id, message.symbol, message.obj, message.msg,
+                    module_paths):
+                violations_dict[src_path].append(violation)
+        return violations_dict
@@ -4,12 +4,67 @@ Classes for querying the information in a test coverage report.
 from __future__ import unicode_literals
 
 import os
-from collections import defaultdict
 
 from xml.etree import cElementTree
 from diff_cover.command_runner import run_command_for_code
 from diff_cover.git_path import GitPathTool
-from diff_cover.violationsreporters.base import BaseViolationReporter, Violation, RegexBasedDriver, QualityDriver
+from diff_cover.violationsreporters.base import (
+    BaseViolationReporter, Violation, ViolationStore, RegexBasedDriver, QualityDriver,
+    in_diff, on_changed_line, probe_command, report_lines
+)
+
+
+class _ReportFile(object):
+    """
+    A file of the lines of a report, encoded as UTF-8, which can be read
+    a piece at a time by `iterparse`.
+    """
+
+    def __init__(self, report):
+        self._lines = report_lines(report)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        pieces, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            piece = line.encode('utf-8')
+            pieces.append(piece)
+            length += len(piece)
+        data = b''.join(pieces)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _iter_elements(report, tag):
+    """
+    Yield each `tag` element of the XML `report` once it has been read,
+    with its children.
+
+    Elements are cleared once they have been yielded, and children of the
+    root once they end, so only one element is kept in memory at a time
+    and not the whole document.
+    """
+    # The report has already been decoded, whatever its declaration says
+    parser = cElementTree.XMLParser(encoding='utf-8')
+    root, depth = None, 0
+    for event, element in cElementTree.iterparse(_ReportFile(report), ('start', 'end'), parser):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if element.tag == tag:
+            yield element
+            element.clear()
+        if depth == 1:
+            root.clear()
 
 
 """
@@ -40,7 +95,7 @@ class CheckstyleXmlDriver(QualityDriver):
         )
         self.command_to_check_install = ['java', 'com.puppycrawl.tools.checkstyle.Main', '-version']
 
-    def parse_reports(self, reports):
+    def parse_reports(self, reports, changed_lines=None):
         """
         Args:
             reports: list[str] - output from the report
@@ -48,17 +103,19 @@ class CheckstyleXmlDriver(QualityDriver):
             A dict[Str:Violation]
             Violation is a simple named tuple Defined above
         """
-        violations_dict = defaultdict(list)
+        violations_dict = ViolationStore()
         for report in reports:
-            xml_document = cElementTree.fromstring("".join(report))
-            files = xml_document.findall(".//file")
-            for file_tree in files:
+            for file_tree in _iter_elements(report, 'file'):
+                filename = GitPathTool.relative_path(file_tree.get('name'))
+                if not in_diff(changed_lines, filename):
+                    continue
                 for error in file_tree.findall('error'):
-                    line_number = error.get('line')
+                    line_number = int(error.get('line'))
+                    if not on_changed_line(changed_lines, filename, line_number):
+                        continue
                     error_str = "{}: {}".format(error.get('severity'),
                                                    error.get('message'))
-                    violation = Violation(int(line_number), error_str)
-                    filename = GitPathTool.relative_path(file_tree.get('name'))
+                    violation = Violation(line_number, error_str)
                     violations_dict[filename].append(violation)
         return violations_dict
 
@@ -69,6 +126,12 @@ class CheckstyleXmlDriver(QualityDriver):
         """
         return run_command_for_code(self.command_to_check_install) == 0
 
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        return probe_command(self.command_to_check_install)
+
 
 class FindbugsXmlDriver(QualityDriver):
     def __init__(self):
@@ -81,7 +144,7 @@ class FindbugsXmlDriver(QualityDriver):
             ['false']
         )
 
-    def parse_reports(self, reports):
+    def parse_reports(self, reports, changed_lines=None):
         """
         Args:
             reports: list[str] - output from the report
@@ -89,24 +152,28 @@ class FindbugsXmlDriver(QualityDriver):
             A dict[Str:Violation]
             Violation is a simple named tuple Defined above
         """
-        violations_dict = defaultdict(list)
+        violations_dict = ViolationStore()
+        # Bugs are not grouped by file, so remember the paths we have seen
+        filenames = {}
         for report in reports:
-            xml_document = cElementTree.fromstring("".join(report))
-            bugs = xml_document.findall(".//BugInstance")
-            for bug in bugs:
-                category = bug.get('category')
-                short_message = bug.find('ShortMessage').text
+            for bug in _iter_elements(report, 'BugInstance'):
                 line = bug.find('SourceLine')
                 if line.get('start') is None or line.get('end') is None:
                     continue
+                sourcepath = line.get('sourcepath')
+                if sourcepath not in filenames:
+                    filenames[sourcepath] = GitPathTool.relative_path(sourcepath)
+                filename = filenames[sourcepath]
+                if not in_diff(changed_lines, filename):
+                    continue
+                category = bug.get('category')
+                short_message = bug.find('ShortMessage').text
                 start = int(line.get('start'))
                 end = int(line.get('end'))
-                for line_number in range(start, end+1):
-                    error_str = "{}: {}".format(category, short_message)
-                    violation = Violation(line_number, error_str)
-                    filename = GitPathTool.relative_path(
-                        line.get('sourcepath'))
-                    violations_dict[filename].append(violation)
+                error_str = "{}: {}".format(category, short_message)
+                # One violation for the whole range, however long it is
+                violation = Violation(start, error_str, end)
+                violations_dict[filename].append(violation)
 
         return violations_dict
 
@@ -129,7 +196,7 @@ class PmdXmlDriver(QualityDriver):
             []
         )
 
-    def parse_reports(self, reports):
+    def parse_reports(self, reports, changed_lines=None):
         """
         Args:
             reports: list[str] - output from the report
@@ -137,18 +204,20 @@ class PmdXmlDriver(QualityDriver):
             A dict[Str:Violation]
             Violation is a simple named tuple Defined above
         """
-        violations_dict = defaultdict(list)
+        violations_dict = ViolationStore()
         for report in reports:
-            xml_document = cElementTree.fromstring("".join(report))
-            node_files = xml_document.findall(".//file")
-            for node_file in node_files:
+            for node_file in _iter_elements(report, 'file'):
+                filename = GitPathTool.relative_path(node_file.get('name'))
+                filename = filename.replace(os.sep, "/")
+                if not in_diff(changed_lines, filename):
+                    continue
                 for error in node_file.findall('violation'):
-                    line_number = error.get('beginline')
+                    line_number = int(error.get('beginline'))
+                    if not on_changed_line(changed_lines, filename, line_number):
+                        continue
                     error_str = "{}: {}".format(error.get('rule'),
                                                 error.text.strip())
-                    violation = Violation(int(line_number), error_str)
-                    filename = GitPathTool.relative_path(node_file.get('name'))
-                    filename = filename.replace(os.sep, "/")
+                    violation = Violation(line_number, error_str)
                     violations_dict[filename].append(violation)
 
         return violations_dict
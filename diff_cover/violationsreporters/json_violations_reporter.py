@@ -0,0 +1,180 @@
+"""
+Drivers that run quality tools with JSON output, which is read as a
+stream instead of being parsed from the tools' human readable output.
+"""
+from __future__ import unicode_literals
+
+import os
+import re
+
+from diff_cover.command_runner import CommandError, execute, run_command_for_code
+from diff_cover.json_stream import WILDCARD, iter_json
+from diff_cover.violationsreporters.base import (
+    QualityDriver, Violation, ViolationStore, in_diff, on_changed_line, probe_command, report_chunks
+)
+from diff_cover.violationsreporters.violations_reporter import (
+    eslint_driver, flake8_driver, ModulePaths, PylintDriver
+)
+
+
+class PylintJsonDriver(QualityDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        self.pylint_driver = PylintDriver()
+        super(PylintJsonDriver, self).__init__(
+            'pylint',
+            ['py'],
+            ['pylint', '--output-format=json'],
+            self.pylint_driver.exit_codes,
+            self.pylint_driver.config_files
+        )
+        self.checks_across_files = self.pylint_driver.checks_across_files
+        self.command_to_check_install = ['pylint', '--version']
+
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+        """
+        violations_dict = ViolationStore()
+        module_paths = ModulePaths(changed_lines)
+        for report in reports:
+            # A list of messages
+            for message in iter_json(report_chunks(report), [WILDCARD]):
+                # Duplicate code is reported in other files too
+                if (message['message-id'] != self.pylint_driver.dupe_code_violation and
+                        not on_changed_line(changed_lines, message['path'], message['line'])):
+                    continue
+                for src_path, violation in self.pylint_driver.message_violations(
+                        message['path'], message['line'], message['message-id'],
+                        message['symbol'], message['obj'], message['message'], module_paths):
+                    if on_changed_line(changed_lines, src_path, violation.line):
+                        violations_dict[src_path].append(violation)
+        return violations_dict
+
+    def installed(self):
+        """
+        Method checks if the provided tool is installed.
+        Returns: boolean True if installed
+        """
+        return run_command_for_code(self.command_to_check_install) == 0
+
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        return probe_command(self.command_to_check_install)
+
+
+class EslintJsonDriver(QualityDriver):
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(EslintJsonDriver, self).__init__(
+            'eslint',
+            ['js'],
+            ['eslint', '--format=json'],
+            # eslint exit code is 1 if there are violations
+            # https://eslint.org/docs/user-guide/command-line-interface#exit-codes
+            [0, 1],
+            eslint_driver.config_files
+        )
+        self.command_to_check_install = eslint_driver.command_to_check_install
+
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+        """
+        violations_dict = ViolationStore()
+        for report in reports:
+            # A list of files, each with a list of messages
+            for result in iter_json(report_chunks(report), [WILDCARD]):
+                src_path = os.path.relpath(result['filePath'])
+                if not in_diff(changed_lines, src_path):
+                    continue
+                for message in result.get('messages', []):
+                    if not message.get('line') or not on_changed_line(changed_lines, src_path, message['line']):
+                        continue
+                    # The same as the compact formatter's messages
+                    error_str = '{} - {}'.format(
+                        'Error' if message.get('fatal') or message.get('severity') == 2 else 'Warning',
+                        message['message']
+                    )
+                    if message.get('ruleId'):
+                        error_str += ' ({})'.format(message['ruleId'])
+                    violations_dict[src_path].append(Violation(message['line'], error_str))
+        return violations_dict
+
+    def installed(self):
+        """
+        Method checks if the provided tool is installed.
+        Returns: boolean True if installed
+        """
+        return run_command_for_code(self.command_to_check_install) == 0
+
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        return probe_command(self.command_to_check_install)
+
+
+class Flake8JsonDriver(QualityDriver):
+    """
+    Uses the JSON formatter from the flake8-json plugin.
+    """
+
+    def __init__(self):
+        """
+        See super for args
+        """
+        super(Flake8JsonDriver, self).__init__(
+            'flake8',
+            ['py'],
+            ['flake8', '--format=json'],
+            flake8_driver.exit_codes,
+            flake8_driver.config_files
+        )
+        self.command_to_check_install = flake8_driver.command_to_check_install
+        # flake8 lists its plugins in its version
+        self.plugin_expression = re.compile(r'flake8[-_]json', re.IGNORECASE)
+
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+        """
+        violations_dict = ViolationStore()
+        for report in reports:
+            # An object mapping each file to its list of messages
+            for message in iter_json(report_chunks(report), [WILDCARD, WILDCARD]):
+                src_path = os.path.relpath(message['filename'])
+                if on_changed_line(changed_lines, src_path, message['line_number']):
+                    violations_dict[src_path].append(
+                        Violation(message['line_number'], '{} {}'.format(message['code'], message['text']))
+                    )
+        return violations_dict
+
+    def installed(self):
+        """
+        Method checks if flake8 and its JSON formatter are installed.
+        Returns: boolean True if installed
+        """
+        try:
+            stdout, _ = execute(self.command_to_check_install)
+        except (CommandError, OSError):
+            return False
+        return self.plugin_expression.search(stdout) is not None
+
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        try:
+            stdout, stderr = execute(self.command_to_check_install)
+        except (CommandError, OSError):
+            return False, None
+        if self.plugin_expression.search(stdout) is None:
+            return False, None
+        return True, stdout + stderr
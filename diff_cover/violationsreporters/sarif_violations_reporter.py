@@ -0,0 +1,92 @@
+"""
+Driver for reports in SARIF, the Static Analysis Results Interchange
+Format, which many analyzers can write.
+
+https://docs.oasis-open.org/sarif/sarif/v2.1.0/sarif-v2.1.0.html
+"""
+from __future__ import unicode_literals
+
+import os
+
+from six.moves.urllib.parse import unquote, urlparse
+
+from diff_cover.json_stream import WILDCARD, iter_json
+from diff_cover.violationsreporters.base import (
+    QualityDriver, Violation, ViolationStore, in_diff, report_chunks
+)
+
+
+class SarifDriver(QualityDriver):
+    def __init__(self):
+        """
+        See super for args.  SARIF reports can come from
+        any tool, about any kind of file.
+        """
+        super(SarifDriver, self).__init__(
+            'sarif',
+            None,
+            ['false']
+        )
+
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+
+        Each result is reported once for each region it is found in,
+        as a violation on the lines of the region.
+        """
+        violations_dict = ViolationStore()
+        for report in reports:
+            # Results are read one at a time, so the whole log is never in memory
+            for result in iter_json(report_chunks(report), ['runs', WILDCARD, 'results', WILDCARD]):
+                message = self._message(result)
+                for location in result.get('locations') or []:
+                    physical_location = location.get('physicalLocation') or {}
+                    src_path = self._src_path(physical_location.get('artifactLocation') or {})
+                    region = physical_location.get('region') or {}
+                    start_line = region.get('startLine')
+                    if src_path is None or start_line is None or not in_diff(changed_lines, src_path):
+                        continue
+
+                    end_line = region.get('endLine') or start_line
+                    violations_dict[src_path].append(Violation(start_line, message, end_line))
+        return violations_dict
+
+    @staticmethod
+    def _message(result):
+        text = (result.get('message') or {}).get('text')
+        rule_id = result.get('ruleId')
+        if rule_id and text:
+            return "{}: {}".format(rule_id, text)
+        return rule_id or text or ''
+
+    @staticmethod
+    def _src_path(artifact_location):
+        """
+        Return the path of the file at `artifact_location`, or None if it
+        does not say (for example, if it only refers to the run's list of
+        artifacts, which we do not keep).
+
+        Relative URIs are taken to be relative to the root of the project,
+        like the paths in the diff.
+        """
+        uri = artifact_location.get('uri')
+        if not uri:
+            return None
+        parsed = urlparse(uri)
+        if parsed.scheme == 'file':
+            return os.path.relpath(unquote(parsed.path))
+        if parsed.scheme:
+            # Not a file (a Windows drive letter is parsed as a scheme)
+            if len(parsed.scheme) > 1:
+                return None
+            return os.path.relpath(unquote(uri))
+        return os.path.normpath(unquote(parsed.path))
+
+    def installed(self):
+        """
+        Method checks if the provided tool is installed.
+        Returns: boolean False: SARIF reports are written by other tools,
+        which diff-quality does not know how to run.
+        """
+        return False
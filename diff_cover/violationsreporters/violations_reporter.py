@@ -6,12 +6,66 @@ from __future__ import unicode_literals
 import re
 from collections import defaultdict
 
+import binascii
 import os
 import itertools
+import operator
 import posixpath
 from diff_cover.command_runner import run_command_for_code
 from diff_cover.git_path import GitPathTool
-from diff_cover.violationsreporters.base import BaseViolationReporter, Violation, RegexBasedDriver, QualityDriver
+from diff_cover.violationsreporters.base import (
+    BaseViolationReporter, Violation, ViolationStore, RegexBasedDriver, QualityDriver,
+    on_changed_line, probe_command, report_line_filter, report_lines
+)
+
+
+# Line bitmaps.
+#
+# Per-file line information is kept as a bytearray indexed by line number,
+# holding 1 for the lines in the set and 0 otherwise.  Merging many reports
+# is then done with whole-bitmap AND/OR operations (on the bitmaps
+# reinterpreted as big integers) instead of per-line set operations.
+
+
+def _line_bitmap(line_numbers, size):
+    """
+    Return a bitmap of `size` lines with the lines in `line_numbers` set.
+    """
+    bitmap = bytearray(size)
+    for line_number in line_numbers:
+        bitmap[line_number] = 1
+    return bitmap
+
+
+def _bitmap_op(left, right, size, op):
+    """
+    Combine two bitmaps, resized to `size` lines, with a bitwise `op`
+    such as `operator.and_`.
+    """
+    if size == 0:
+        return bytearray()
+    left = bytes(left[:size] + bytearray(max(size - len(left), 0)))
+    right = bytes(right[:size] + bytearray(max(size - len(right), 0)))
+    value = op(int(binascii.hexlify(left), 16), int(binascii.hexlify(right), 16))
+    return bytearray(binascii.unhexlify('%0*x' % (size * 2, value)))
+
+
+def _bitmap_and(left, right):
+    return _bitmap_op(left, right, min(len(left), len(right)), operator.and_)
+
+
+def _bitmap_or(left, right):
+    return _bitmap_op(left, right, max(len(left), len(right)), operator.or_)
+
+
+def _bitmap_lines(bitmap):
+    """
+    Yield the line numbers set in `bitmap`, in ascending order.
+    """
+    line_number = bitmap.find(b'\x01')
+    while line_number != -1:
+        yield line_number
+        line_number = bitmap.find(b'\x01', line_number + 1)
 
 
 class XmlCoverageReporter(BaseViolationReporter):
@@ -33,6 +87,10 @@ class XmlCoverageReporter(BaseViolationReporter):
 
         self._src_roots = src_roots
 
+        # Per-document `{path: [line nodes]}` indexes for the formats
+        # that are looked up by path, keyed by `id()` of the document
+        self._path_indexes = {}
+
     @staticmethod
     def _to_unix_path(path):
         """
@@ -108,6 +166,29 @@ class XmlCoverageReporter(BaseViolationReporter):
             lines = [clazz.findall('./lines/line') for clazz in classes]
             return [elem for elem in itertools.chain(*lines)]
 
+    def _path_index(self, xml_document, build_index):
+        """
+        Return the `{path: [line nodes]}` index for `xml_document`,
+        building it with `build_index` the first time it is needed.
+        """
+        key = id(xml_document)
+        if key not in self._path_indexes:
+            self._path_indexes[key] = build_index(xml_document)
+        return self._path_indexes[key]
+
+    def _index_clover(self, xml_document):
+        """
+        Map the relative path of every `<file>` in `xml_document`
+        to its statement line nodes, in one traversal.
+        """
+        index = defaultdict(list)
+        for file_tree in xml_document.findall(".//file"):
+            src_path = GitPathTool.relative_path(file_tree.get('path'))
+            if self._changed_lines is not None and src_path not in self._changed_lines:
+                continue
+            index[src_path].extend(file_tree.findall('./line[@type="stmt"]'))
+        return index
+
     def _get_src_path_line_nodes_clover(self, xml_document, src_path):
         """
         Return a list of nodes containing line information for `src_path`
@@ -115,22 +196,36 @@ class XmlCoverageReporter(BaseViolationReporter):
 
         If file is not present in `xml_document`, return None
         """
+        return self._path_index(xml_document, self._index_clover).get(src_path)
 
-        files = [file_tree
-                 for file_tree in xml_document.findall(".//file")
-                 if GitPathTool.relative_path(file_tree.get('path')) == src_path
-                 or []]
-        if not files:
-            return None
-        lines = [file_tree.findall('./line[@type="stmt"]')
-                 for file_tree in files]
-        return [elem for elem in itertools.chain(*lines)]
-
-    def _measured_source_path_matches(self, package_name, file_name, src_path):
-        # find src_path in any of the source roots
-        for root in self._src_roots:
-            if os.path.normcase(GitPathTool.relative_path(os.path.join(root, package_name, file_name))) == os.path.normcase(src_path):
-                return True
+    def _index_jacoco(self, xml_document):
+        """
+        Map the normalized relative path of every `<sourcefile>` in
+        `xml_document`, under each of the source roots, to its line nodes,
+        in one traversal.
+        """
+        wanted = None
+        if self._changed_lines is not None:
+            wanted = {os.path.normcase(src_path) for src_path in self._changed_lines}
+
+        index = defaultdict(list)
+        for pkg in xml_document.findall(".//package"):
+            for _file in pkg.findall('sourcefile'):
+                # A file may be found under several source roots,
+                # but should only contribute its lines once per path
+                src_paths = {
+                    os.path.normcase(GitPathTool.relative_path(
+                        os.path.join(root, pkg.get('name'), _file.get('name'))
+                    ))
+                    for root in self._src_roots
+                }
+                if wanted is not None:
+                    src_paths &= wanted
+                if src_paths:
+                    lines = _file.findall('./line')
+                    for src_path in src_paths:
+                        index[src_path].extend(lines)
+        return index
 
     def _get_src_path_line_nodes_jacoco(self, xml_document, src_path):
         """
@@ -139,22 +234,7 @@ class XmlCoverageReporter(BaseViolationReporter):
 
         If file is not present in `xml_document`, return None
         """
-
-        files = []
-        packages = [pkg for pkg in xml_document.findall(".//package")]
-        for pkg in packages:
-            _files = [_file
-                      for _file in pkg.findall('sourcefile')
-                      if self._measured_source_path_matches(pkg.get('name'), _file.get('name'), src_path)
-                      or []
-                      ]
-            files.extend(_files)
-
-        if not files:
-            return None
-        lines = [file_tree.findall('./line')
-                 for file_tree in files]
-        return [elem for elem in itertools.chain(*lines)]
+        return self._path_index(xml_document, self._index_jacoco).get(os.path.normcase(src_path))
 
     def _cache_file(self, src_path):
         """
@@ -167,11 +247,14 @@ class XmlCoverageReporter(BaseViolationReporter):
             # Thus, each time, we take the intersection.  However, to do this
             # we must treat the first time as a special case and just add all
             # the violations from the first xml report.
-            violations = None
+            uncovered = None
 
             # A line is measured if it is measured in any of the reports, so
-            # we take set union each time and can just start with the empty set
-            measured = set()
+            # we take the union each time and can just start with the empty bitmap
+            measured = bytearray()
+
+            # Only lines changed by the diff matter, if we know what they are
+            changed_lines = self._lines_of_interest(src_path)
 
             # Loop through the files that contain the xml roots
             for xml_document in self._xml_roots:
@@ -193,34 +276,33 @@ class XmlCoverageReporter(BaseViolationReporter):
                 if line_nodes is None:
                     continue
 
+                line_entries = [(int(line.get(_number)), line) for line in line_nodes]
+                if changed_lines is not None:
+                    line_entries = [(line_number, line) for line_number, line in line_entries
+                                    if line_number in changed_lines]
+                line_numbers = [line_number for line_number, _ in line_entries]
+                size = max(line_numbers) + 1 if line_numbers else 0
+                report_uncovered = _line_bitmap(
+                    (line_number
+                     for line_number, line in line_entries
+                     if int(line.get(_hits, 0)) == 0),
+                    size
+                )
+
                 # First case, need to define violations initially
-                if violations is None:
-                    violations = {
-                        Violation(int(line.get(_number)), None)
-                        for line in line_nodes
-                        if int(line.get(_hits, 0)) == 0}
-
-                # If we already have a violations set,
-                # take the intersection of the new
-                # violations set and its old self
+                if uncovered is None:
+                    uncovered = report_uncovered
                 else:
-                    violations = violations & {
-                        Violation(int(line.get(_number)), None)
-                        for line in line_nodes
-                        if int(line.get(_hits, 0)) == 0
-                    }
-
-                # Measured is the union of itself and the new measured
-                measured = measured | {
-                    int(line.get(_number)) for line in line_nodes
-                }
+                    uncovered = _bitmap_and(uncovered, report_uncovered)
+
+                measured = _bitmap_or(measured, _line_bitmap(line_numbers, size))
 
             # If we don't have any information about the source file,
             # don't report any violations
-            if violations is None:
-                violations = set()
+            if uncovered is None:
+                uncovered = bytearray()
 
-            self._info_cache[src_path] = (violations, measured)
+            self._info_cache[src_path] = (uncovered, measured)
 
     def violations(self, src_path):
         """
@@ -230,14 +312,148 @@ class XmlCoverageReporter(BaseViolationReporter):
         self._cache_file(src_path)
 
         # Yield all lines not covered
-        return self._info_cache[src_path][0]
+        return {Violation(line_number, None)
+                for line_number in _bitmap_lines(self._info_cache[src_path][0])}
 
     def measured_lines(self, src_path):
         """
         See base class docstring.
         """
         self._cache_file(src_path)
-        return self._info_cache[src_path][1]
+        return set(_bitmap_lines(self._info_cache[src_path][1]))
+
+
+class LcovCoverageReporter(BaseViolationReporter):
+    """
+    Query information from LCOV tracefiles (the `.info` files written by
+    lcov, geninfo, istanbul/nyc and friends).
+
+    Tracefiles are streamed line by line.  Only the `SF:` (source file),
+    `DA:` (line data) and `end_of_record` records are used.
+    """
+
+    def __init__(self, lcov_roots):
+        """
+        Load the LCOV tracefiles in `lcov_roots`, a list of open file
+        handles.  The handles are read the first time coverage
+        information is requested.
+
+        Once the changed lines are known (see `set_changed_lines()`),
+        records for source files outside the diff are skipped without
+        looking at their line data, and line data outside the changed
+        lines is dropped as it is read.
+        """
+        super(LcovCoverageReporter, self).__init__("LCOV")
+        self._lcov_roots = lcov_roots
+
+        # Keys are normalized absolute source paths,
+        # values are `(uncovered, measured)` line bitmaps
+        self._info_cache = None
+
+    @staticmethod
+    def _to_key(abs_path):
+        """
+        Normalize an absolute path so that paths from the tracefiles
+        and paths from the diff can be compared.
+        """
+        return XmlCoverageReporter._to_unix_path(abs_path)
+
+    @classmethod
+    def _src_path_key(cls, src_path):
+        return cls._to_key(GitPathTool.absolute_path(src_path))
+
+    @classmethod
+    def _record_key(cls, record_path):
+        # Relative `SF:` paths are relative to where the tracefile was made,
+        # which (like coverage.py's XML report) we assume is the cwd
+        return cls._to_key(os.path.abspath(record_path))
+
+    @staticmethod
+    def _lines(lcov_root):
+        for line in lcov_root:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
+            yield line.strip()
+
+    def _merge_record(self, key, uncovered, measured):
+        """
+        Combine one `SF:` record with what we already know about the file.
+        A line is uncovered only if it is uncovered in every record that
+        measures the file, and measured if any record measures it.
+        """
+        size = max(measured) + 1 if measured else 0
+        uncovered = _line_bitmap(uncovered, size)
+        measured = _line_bitmap(measured, size)
+        if key in self._info_cache:
+            old_uncovered, old_measured = self._info_cache[key]
+            self._info_cache[key] = (_bitmap_and(old_uncovered, uncovered),
+                                     _bitmap_or(old_measured, measured))
+        else:
+            self._info_cache[key] = (uncovered, measured)
+
+    def _load(self):
+        """
+        Stream every tracefile once, recording line data for
+        the source files we are interested in.
+        """
+        if self._info_cache is not None:
+            return
+        self._info_cache = {}
+
+        # Keys are normalized absolute source paths, values are the
+        # changed lines in that file
+        wanted = None
+        if self._changed_lines is not None:
+            wanted = {
+                self._src_path_key(src_path): lines
+                for src_path, lines in self._changed_lines.items()
+            }
+
+        for lcov_root in self._lcov_roots:
+            key = None
+            uncovered = measured = changed_lines = None
+            for line in self._lines(lcov_root):
+                if line.startswith('SF:'):
+                    key = self._record_key(line[3:])
+                    if wanted is not None:
+                        if key not in wanted:
+                            # Skip everything up to this record's end_of_record
+                            key = None
+                            continue
+                        changed_lines = wanted[key]
+                    uncovered, measured = [], []
+                elif key is None:
+                    continue
+                elif line.startswith('DA:'):
+                    # DA:<line number>,<execution count>[,<checksum>]
+                    fields = line[3:].split(',')
+                    line_number = int(fields[0])
+                    if changed_lines is not None and line_number not in changed_lines:
+                        continue
+                    measured.append(line_number)
+                    if int(fields[1]) == 0:
+                        uncovered.append(line_number)
+                elif line == 'end_of_record':
+                    self._merge_record(key, uncovered, measured)
+                    key = None
+
+    def _cache_file(self, src_path):
+        self._load()
+        return self._info_cache.get(self._src_path_key(src_path), (bytearray(), bytearray()))
+
+    def violations(self, src_path):
+        """
+        See base class comments.
+        """
+        return {Violation(line_number, None)
+                for line_number in _bitmap_lines(self._cache_file(src_path)[0])}
+
+    def measured_lines(self, src_path):
+        """
+        See base class docstring.
+        """
+        return set(_bitmap_lines(self._cache_file(src_path)[1]))
+
 
 pycodestyle_driver = RegexBasedDriver(
     name='pycodestyle',
@@ -245,6 +461,9 @@ pycodestyle_driver = RegexBasedDriver(
     command=['pycodestyle'],
     expression=r'^([^:]+):(\d+).*([EW]\d{3}.*)$',
     command_to_check_install=['pycodestyle', '--version'],
+    config_files=['setup.cfg', 'tox.ini', '.pycodestyle'],
+    # Only report violations on the lines a diff from stdin adds
+    diff_options=['--diff'],
     # pycodestyle exit code is 1 if there are violations
     # http://pycodestyle.pycqa.org/en/latest/intro.html
     exit_codes=[0, 1]
@@ -285,6 +504,7 @@ flake8_driver = RegexBasedDriver(
     # path/to/file.py:418: 'random' imported but unused
     expression=r'^([^:]+):(\d+).*([EWFCNTIBDSQ]\d{3}.*)$',
     command_to_check_install=['flake8', '--version'],
+    config_files=['setup.cfg', 'tox.ini', '.flake8'],
     # flake8 exit code is 1 if there are violations
     # http://flake8.pycqa.org/en/latest/user/invocation.html
     exit_codes=[0, 1]
@@ -295,7 +515,8 @@ jshint_driver = RegexBasedDriver(
     supported_extensions=['js'],
     command=['jshint'],
     expression=r'^([^:]+): line (\d+), col \d+, (.*)$',
-    command_to_check_install=['jshint', '-v']
+    command_to_check_install=['jshint', '-v'],
+    config_files=['.jshintrc', '.jshintignore', 'package.json']
 )
 
 eslint_driver = RegexBasedDriver(
@@ -304,6 +525,8 @@ eslint_driver = RegexBasedDriver(
     command=['eslint', '--format=compact'],
     expression=r'^([^:]+): line (\d+), col \d+, (.*)$',
     command_to_check_install=['eslint', '-v'],
+    config_files=['.eslintrc', '.eslintrc.js', '.eslintrc.json', '.eslintrc.yaml', '.eslintrc.yml',
+                  '.eslintignore', 'package.json'],
 )
 
 """
@@ -321,14 +544,74 @@ pydocstyle_driver = RegexBasedDriver(
     name='pydocstyle',
     supported_extensions=['py'],
     command=['pydocstyle'],
-    expression=r'^(.+?):(\d+).*?$.+?^        (.*?)$',
+    # Match pairs of lines of the form:
+    # path/to/file.py:13 in public function `gather`:
+    #         D103: Missing docstring in public function
+    expression=r'^(\S.*?):(\d+)\b',
+    message_expression=r'^\s+(\S.*?)\s*$',
     command_to_check_install=['pydocstyle', '--version'],
-    flags=re.MULTILINE | re.DOTALL,
+    config_files=['setup.cfg', 'tox.ini', '.pydocstyle', '.pydocstylerc', '.pydocstyle.ini', '.pydocstylerc.ini'],
     # pydocstyle exit code is 1 if there are violations
     # http://www.pydocstyle.org/en/2.1.1/usage.html#return-code
     exit_codes=[0, 1]
 )
 
+
+class ModulePaths(object):
+    """
+    Finds the source files of the modules that pylint names in its
+    duplicate code messages, among a list of source files.
+    """
+
+    def __init__(self, src_paths=None):
+        """
+        Args:
+            src_paths: iterable of str - the source files to look in (such
+                as the files in the diff), or None to guess the files from
+                the module names alone.
+        """
+        self._src_paths = src_paths
+        self._index = None
+        self._found = {}
+
+    def path(self, module):
+        """
+        Return the path to the source file of `module`.
+        """
+        src_path = self._found.get(module)
+        if src_path is None:
+            if self._index is None:
+                self._index = self._build_index()
+            candidates = self._index.get(os.path.normcase(module), [])
+            if len(candidates) == 1:
+                src_path = candidates[0]
+            else:
+                # Modules that are not in the source files (or could be any
+                # of several) are looked for under the current directory
+                src_path = os.path.join(*module.split('.')) + '.py'
+            self._found[module] = src_path
+        return src_path
+
+    def _build_index(self):
+        """
+        Map each name a source file can be imported as to the files with
+        that name.  Modules are named relative to their source root, which
+        may be below the current directory, so a file is indexed under the
+        names from each of its parent directories.
+        """
+        index = defaultdict(list)
+        for src_path in self._src_paths or []:
+            root, ext = os.path.splitext(os.path.normpath(src_path))
+            if ext != '.py':
+                continue
+            parts = root.split(os.sep)
+            if parts[-1] == '__init__':
+                parts.pop()
+            for start in range(len(parts)):
+                index[os.path.normcase('.'.join(parts[start:]))].append(src_path)
+        return index
+
+
 class PylintDriver(QualityDriver):
     def __init__(self):
         """
@@ -349,79 +632,118 @@ class PylintDriver(QualityDriver):
                  2,
                  4, 2 | 4,
                  8, 2 | 8, 4 | 8, 2 | 4 | 8,
-                 16, 2 | 16, 4 | 16, 2 | 4 | 16, 8 | 16, 2 | 8 | 16, 4 | 8 | 16, 2 | 4 | 8 | 16]
+                 16, 2 | 16, 4 | 16, 2 | 4 | 16, 8 | 16, 2 | 8 | 16, 4 | 8 | 16, 2 | 4 | 8 | 16],
+                config_files=['pylintrc', '.pylintrc', 'setup.cfg', 'pyproject.toml']
         )
         self.pylint_expression = re.compile(r'^([^:]+):(\d+): \[(\w+),? ?([^\]]*)] (.*)$')
         self.dupe_code_violation = 'R0801'
+        self.checks_across_files = True
         self.command_to_check_install = ['pylint', '--version']
 
         # Match lines of the form:
-        # path/to/file.py:123: [C0111] Missing docstring
-        # path/to/file.py:456: [C0111, Foo.bar] Missing docstring
-        self.multi_line_violation_regex = re.compile(r'==(\w|.+):(.*)')
+        # ==path.to.module:123
+        # ==path.to.module:[123:130]
+        # which follow a duplicate code message, one for each file involved
+        self.multi_line_violation_regex = re.compile(r'==([^:]+):\[?(\d+)')
         self.dupe_code_violation_regex = re.compile(r'Similar lines in (\d+) files')
 
-    def _process_dupe_code_violation(self, lines, current_line, message):
+    def _involved_file(self, line, module_paths):
         """
-        The duplicate code violation is a multi line error. This pulls out
-        all the relevant files
+        Return a `(src_path, line_number)` tuple for a `line` naming one of
+        the files involved in a duplicate code message, or None if the line
+        is something else.
         """
-        src_paths = []
-        message_match = self.dupe_code_violation_regex.match(message)
-        if message_match:
-            for _ in range(int(message_match.group(1))):
-                current_line += 1
-                match = self.multi_line_violation_regex.match(
-                    lines[current_line]
-                )
-                src_path, l_number = match.groups()
-                src_paths.append(('%s.py' % src_path, l_number))
-        return src_paths
+        match = self.multi_line_violation_regex.match(line)
+        if match is None:
+            return None
+        module, line_number = match.groups()
+        return module_paths.path(module), int(line_number)
 
-    def parse_reports(self, reports):
+    def message_violations(self, src_path, line_number, msg_id, symbol, obj, message, module_paths=None):
         """
-        Args:
-            reports: list[str] - output from the report
-        Return:
-            A dict[Str:Violation]
-            Violation is a simple named tuple Defined above
+        Return a list of `(src_path, Violation)` tuples for a message
+        that pylint reported in a structured form (rather than as text).
+        Duplicate code messages give a violation in each file involved,
+        found with `module_paths` (a `ModulePaths`).
         """
-        violations_dict = defaultdict(list)
-        for report in reports:
-            output_lines = report.split('\n')
+        if msg_id == self.dupe_code_violation:
+            lines = message.split('\n')
+            message = lines[0]
+            dupe_match = self.dupe_code_violation_regex.match(message)
+            file_count = int(dupe_match.group(1)) if dupe_match else 0
+            if module_paths is None:
+                module_paths = ModulePaths()
+            files_involved = [
+                involved for involved in
+                (self._involved_file(line, module_paths) for line in lines[1:file_count + 1])
+                if involved is not None
+            ]
+        else:
+            files_involved = [(src_path, line_number)]
+
+        # The same as the messages parsed from our --msg-template
+        error_str = "{}: ({}), {}: {}".format(msg_id, symbol, obj, message)
+        return [
+            (involved_path, Violation(int(involved_line), error_str))
+            for involved_path, involved_line in files_involved
+        ]
 
-            for output_line_number, line in enumerate(output_lines):
+    def parse_reports(self, reports, changed_lines=None):
+        """
+        See base class docstring.
+        """
+        violations_dict = ViolationStore()
+        mentions_changed_file = report_line_filter(changed_lines)
+        module_paths = ModulePaths(changed_lines)
+        for report in reports:
+            # The duplicate code message being read, and how many
+            # of the files it involves are still to be read
+            dupe_message, files_left = None, 0
+
+            for line in report_lines(report):
+                line = line.rstrip('\r\n')
+
+                # The files involved in duplicate code are listed after the message
+                if files_left:
+                    involved = self._involved_file(line, module_paths)
+                    if involved is not None:
+                        files_left -= 1
+                        src_path, line_number = involved
+                        if on_changed_line(changed_lines, src_path, line_number):
+                            violations_dict[src_path].append(Violation(line_number, dupe_message))
+                        continue
+                    files_left = 0
+
+                # Skip lines about other files before matching them
+                if (mentions_changed_file is not None and not mentions_changed_file(line)
+                        and self.dupe_code_violation not in line):
+                    continue
                 match = self.pylint_expression.match(line)
 
                 # Ignore any line that isn't matched
                 # (for example, snippets from the source code)
-                if match is not None:
-
-                    (pylint_src_path,
-                     line_number,
-                     pylint_code,
-                     function_name,
-                     message) = match.groups()
-                    if pylint_code == self.dupe_code_violation:
-                        files_involved = self._process_dupe_code_violation(
-                            output_lines,
-                            output_line_number,
-                            message
-                        )
-                    else:
-                        files_involved = [(pylint_src_path, line_number)]
-
-                    for violation in files_involved:
-                        pylint_src_path, line_number = violation
-                        # If we're looking for a particular source file,
-                        # ignore any other source files.
-                        if function_name:
-                            error_str = "{}: {}: {}".format(pylint_code, function_name, message)
-                        else:
-                            error_str = "{}: {}".format(pylint_code, message)
-
-                        violation = Violation(int(line_number), error_str)
-                        violations_dict[pylint_src_path].append(violation)
+                if match is None:
+                    continue
+
+                (pylint_src_path,
+                 line_number,
+                 pylint_code,
+                 function_name,
+                 message) = match.groups()
+                if function_name:
+                    error_str = "{}: {}: {}".format(pylint_code, function_name, message)
+                else:
+                    error_str = "{}: {}".format(pylint_code, message)
+
+                if pylint_code == self.dupe_code_violation:
+                    dupe_match = self.dupe_code_violation_regex.match(message)
+                    dupe_message = error_str
+                    files_left = int(dupe_match.group(1)) if dupe_match else 0
+                    continue
+
+                line_number = int(line_number)
+                if on_changed_line(changed_lines, pylint_src_path, line_number):
+                    violations_dict[pylint_src_path].append(Violation(line_number, error_str))
 
         return violations_dict
 
@@ -431,3 +753,9 @@ class PylintDriver(QualityDriver):
         Returns: boolean True if installed
         """
         return run_command_for_code(self.command_to_check_install) == 0
+
+    def probe(self):
+        """
+        See base class docstring.
+        """
+        return probe_command(self.command_to_check_install)